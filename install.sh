@@ -109,6 +109,7 @@ install_dependencies() {
         "openssh-server"
         "ffmpeg"
         "v4l-utils"
+        "libyaml-dev"
     )
     
     # Optional monitoring packages (install if available)
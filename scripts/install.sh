@@ -143,6 +143,7 @@ pip install \
     imageio>=2.31.0 \
     flask>=2.3.0 \
     flask-socketio>=5.3.0 \
+    simple-websocket>=1.0.0 \
     requests>=2.31.0 \
     pyyaml>=6.0 \
     configparser>=5.3.0 \
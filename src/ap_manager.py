@@ -6,19 +6,58 @@ Handles switching between AP mode and normal WiFi client mode
 
 import os
 import sys
+import asyncio
+import fcntl
+import ipaddress
+import socket
+import shutil
+import struct
 import subprocess
 import time
 import argparse
 import logging
+import copy
+import tempfile
+from functools import cached_property
 from pathlib import Path
 import yaml
-import psutil
-import netifaces
+
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
 
 # Auto-detect config path
 SCRIPT_DIR = Path(__file__).parent
 CONFIG_PATH = SCRIPT_DIR.parent / "config" / "settings.yaml"
 
+# How long an interface snapshot stays valid (seconds)
+IFACE_CACHE_TTL = 2.0
+
+# Kernel ARP table
+ARP_TABLE_PATH = "/proc/net/arp"
+
+# Per-interface link attributes and the ioctl for an interface's IPv4 address
+SYS_CLASS_NET = "/sys/class/net"
+SIOCGIFADDR = 0x8915
+IFF_UP = 0x1
+
+# systemd D-Bus names
+SYSTEMD_BUS_NAME = "org.freedesktop.systemd1"
+SYSTEMD_OBJECT_PATH = "/org/freedesktop/systemd1"
+SYSTEMD_MANAGER_IFACE = "org.freedesktop.systemd1.Manager"
+SYSTEMD_UNIT_IFACE = "org.freedesktop.systemd1.Unit"
+DBUS_PROPERTIES_IFACE = "org.freedesktop.DBus.Properties"
+
+# Pre-split argv prefixes for the fixed set of commands APManager runs;
+# the executable is resolved to an absolute path on first use
+COMMAND_TEMPLATES = {
+    'shell': ('sudo', 'sh', '-c'),
+    'systemctl': ('sudo', 'systemctl'),
+    'sysctl': ('sudo', 'sysctl'),
+    'copy': ('sudo', 'cp'),
+}
+
 class APManager:
     """
     Manages WiFi Access Point functionality for Radxa Rock5B+
@@ -29,20 +68,36 @@ class APManager:
         Initialize AP Manager
         
         Args:
-            config_path: Path to configuration file (auto-detected if None)
+            config_path: Path to configuration file (auto-detected if None),
+                or an already-parsed config dict
         """
-        if config_path is None:
-            config_path = str(CONFIG_PATH)
-        self.config = self.load_config(config_path)
+        if isinstance(config_path, dict):
+            # Parsed once by the caller; copy so changes here stay local
+            self.config = copy.deepcopy(config_path)
+        else:
+            if config_path is None:
+                config_path = str(CONFIG_PATH)
+            self.config = self.load_config(config_path)
         self.wifi_interface = self.config['network']['wifi_interface']
         self.ap_config = self.config['network']['ap_config']
         self.logger = self.setup_logging()
         
+        # Interface snapshot: (timestamp, interfaces)
+        self._iface_cache = (0.0, None)
+        
+        # systemd D-Bus connection (opened on first use, False if unavailable)
+        # and cached unit states: {service: (timestamp, state)}
+        self._systemd = None
+        self._service_states = {}
+        
+        # COMMAND_TEMPLATES with resolved executable paths
+        self._resolved_commands = {}
+        
     def load_config(self, config_path):
         """Load configuration from YAML file"""
         try:
             with open(config_path, 'r') as file:
-                return yaml.safe_load(file)
+                return yaml.load(file, Loader=YamlLoader)
         except Exception as e:
             print(f"Error loading config: {e}")
             sys.exit(1)
@@ -55,14 +110,48 @@ class APManager:
         )
         return logging.getLogger(__name__)
         
-    def run_command(self, command, check=True):
-        """Execute shell command and return result"""
+    def _command_argv(self, name, *args):
+        """Build argv for a COMMAND_TEMPLATES entry, resolving its executable once"""
+        prefix = self._resolved_commands.get(name)
+        if prefix is None:
+            template = COMMAND_TEMPLATES[name]
+            prefix = [shutil.which(template[0]) or template[0]] + list(template[1:])
+            self._resolved_commands[name] = prefix
+        return prefix + list(args)
+        
+    def run_command(self, command, check=True, input=None):
+        """
+        Execute shell command and return result
+        
+        Args:
+            command: Command string, or a list of commands to run as one
+                     root shell script (one fork/exec and sudo for the batch)
+            check: Raise on failure; for a batch, stop at the first failing command
+            input: Optional text fed to the command's stdin
+        """
+        if isinstance(command, (list, tuple)):
+            script = "\n".join((["set -e"] if check else []) + list(command))
+            argv = self._command_argv('shell', script)
+            command = "; ".join(command)
+        else:
+            argv = command.split()
+            
+        return self._run_argv(argv, command, check, input)
+        
+    def run_command_tpl(self, name, *args, check=True, input=None):
+        """Execute a pre-split COMMAND_TEMPLATES command with extra arguments"""
+        argv = self._command_argv(name, *args)
+        return self._run_argv(argv, " ".join(argv), check, input)
+        
+    def _run_argv(self, argv, command, check, input):
+        """Run an argv list and return (stdout, stderr)"""
         try:
             result = subprocess.run(
-                command.split(), 
+                argv, 
                 capture_output=True, 
                 text=True, 
-                check=check
+                check=check,
+                input=input
             )
             return result.stdout.strip(), result.stderr.strip()
         except subprocess.CalledProcessError as e:
@@ -70,23 +159,129 @@ class APManager:
             self.logger.error(f"Error: {e.stderr}")
             return None, e.stderr
             
+    def _get_iface_snapshot(self):
+        """Return the cached interface name list, refreshing after IFACE_CACHE_TTL"""
+        timestamp, interfaces = self._iface_cache
+        if interfaces is None or time.monotonic() - timestamp >= IFACE_CACHE_TTL:
+            # Imported lazily: only interface queries need this C extension
+            import netifaces
+            
+            interfaces = netifaces.interfaces()
+            self._iface_cache = (time.monotonic(), interfaces)
+        return interfaces
+        
+    def invalidate_iface_cache(self):
+        """Force the next interface query to refetch from the kernel"""
+        self._iface_cache = (0.0, None)
+        
+    def _get_systemd(self):
+        """Return cached (bus, manager) D-Bus proxies for systemd, or None if unavailable"""
+        if self._systemd is None:
+            try:
+                import dbus
+                bus = dbus.SystemBus()
+                manager = bus.get_object(SYSTEMD_BUS_NAME, SYSTEMD_OBJECT_PATH)
+                self._systemd = (bus, manager)
+            except Exception as e:
+                self.logger.debug(f"systemd D-Bus unavailable, falling back to systemctl: {e}")
+                self._systemd = False
+        return self._systemd or None
+        
+    def get_service_state(self, service):
+        """Get systemd ActiveState of a service (e.g. 'active', 'inactive', 'failed')"""
+        cached = self._service_states.get(service)
+        if cached and time.monotonic() - cached[0] < IFACE_CACHE_TTL:
+            return cached[1]
+            
+        state = None
+        systemd = self._get_systemd()
+        if systemd:
+            bus, manager = systemd
+            try:
+                unit_path = manager.LoadUnit(f"{service}.service",
+                                             dbus_interface=SYSTEMD_MANAGER_IFACE)
+                unit = bus.get_object(SYSTEMD_BUS_NAME, unit_path)
+                state = str(unit.Get(SYSTEMD_UNIT_IFACE, 'ActiveState',
+                                     dbus_interface=DBUS_PROPERTIES_IFACE))
+            except Exception as e:
+                self.logger.debug(f"D-Bus query for {service} failed: {e}")
+                
+        if state is None:
+            state = self.run_command_tpl('systemctl', 'is-active', service, check=False)[0]
+            
+        self._service_states[service] = (time.monotonic(), state)
+        return state
+        
     def check_interface_exists(self, interface):
         """Check if network interface exists"""
-        return interface in netifaces.interfaces()
+        return interface in self._get_iface_snapshot()
+        
+    def _read_small_file(self, path):
+        """
+        Read a small /proc or /sys file with raw open/read/close syscalls
         
-    def get_interface_status(self, interface):
-        """Get status of network interface"""
+        Skips the fstat/ioctl/lseek round trips a buffered text-mode open()
+        performs, which dominate the cost of these tiny virtual files.
+        """
+        fd = os.open(path, os.O_RDONLY)
         try:
-            stats = psutil.net_if_stats()
-            addrs = psutil.net_if_addrs()
-            
-            if interface in stats:
-                return {
-                    'exists': True,
-                    'is_up': stats[interface].isup,
-                    'speed': stats[interface].speed,
-                    'addresses': addrs.get(interface, [])
-                }
+            chunks = []
+            while True:
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        finally:
+            os.close(fd)
+        return b''.join(chunks).decode()
+        
+    def _read_sysfs(self, interface, attribute):
+        """Read a /sys/class/net/<interface> attribute"""
+        return self._read_small_file(f"{SYS_CLASS_NET}/{interface}/{attribute}").strip()
+            
+    def _get_ipv4_address(self, interface):
+        """Get the primary IPv4 address of an interface via SIOCGIFADDR, or None"""
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            try:
+                ifreq = fcntl.ioctl(sock.fileno(), SIOCGIFADDR,
+                                    struct.pack('256s', interface[:15].encode()))
+            except OSError:
+                # No address assigned (or no such interface)
+                return None
+        return socket.inet_ntoa(ifreq[20:24])
+        
+    def get_interface_status(self, interface, fetch_addrs=False):
+        """
+        Get status of network interface
+        
+        Args:
+            interface: Interface name
+            fetch_addrs: Also look up the interface's IPv4 address ('addresses' key);
+                         skipped by default since most callers only need up/down state
+        """
+        try:
+            # Direct per-interface reads; no enumeration of every NIC
+            flags = int(self._read_sysfs(interface, 'flags'), 16)
+            
+            try:
+                # Unreadable (EINVAL) for wireless or down links
+                speed = max(int(self._read_sysfs(interface, 'speed')), 0)
+            except (OSError, ValueError):
+                speed = 0
+                
+            status = {
+                'exists': True,
+                'is_up': bool(flags & IFF_UP),
+                'speed': speed
+            }
+            
+            if fetch_addrs:
+                address = self._get_ipv4_address(interface)
+                status['addresses'] = [address] if address else []
+                
+            return status
+        except FileNotFoundError:
+            pass
         except Exception as e:
             self.logger.error(f"Error getting interface status: {e}")
             
@@ -96,9 +291,10 @@ class APManager:
         """Stop network services before switching modes"""
         services = ['hostapd', 'dnsmasq', 'dhcpcd']
         
-        for service in services:
-            self.logger.info(f"Stopping {service}")
-            self.run_command(f"sudo systemctl stop {service}", check=False)
+        # systemctl accepts multiple units per invocation
+        self.logger.info(f"Stopping {', '.join(services)}")
+        self.run_command_tpl('systemctl', 'stop', *services, check=False)
+        self._service_states.clear()
             
     def enable_ap_mode(self):
         """Enable Access Point mode"""
@@ -130,9 +326,10 @@ class APManager:
         # Start services
         return self.start_ap_services()
         
-    def create_hostapd_config(self):
-        """Create hostapd configuration file"""
-        config_content = f"""interface={self.wifi_interface}
+    @cached_property
+    def hostapd_conf_bytes(self):
+        """hostapd configuration, built once per process"""
+        return f"""interface={self.wifi_interface}
 driver=nl80211
 ssid={self.ap_config['ssid']}
 hw_mode=g
@@ -146,12 +343,70 @@ wpa_passphrase={self.ap_config['password']}
 wpa_key_mgmt=WPA-PSK
 wpa_pairwise=TKIP
 rsn_pairwise=CCMP
-"""
+""".encode()
+        
+    @cached_property
+    def dnsmasq_conf_bytes(self):
+        """dnsmasq configuration, built once per process"""
+        return f"""interface={self.wifi_interface}
+dhcp-range={self.ap_config['dhcp_start']},{self.ap_config['dhcp_end']},255.255.255.0,24h
+""".encode()
+        
+    @cached_property
+    def ap_network(self):
+        """AP client subnet (from ap_config ip_range), parsed once"""
+        return ipaddress.ip_network(self.ap_config['ip_range'], strict=False)
+        
+    def _write_atomic(self, path, data, mode=0o644):
+        """
+        Atomically replace path with bytes using unbuffered writes
+        
+        The data goes to a sibling temp file that is fsynced and renamed over
+        path, so readers never see a partially written config. A symlinked
+        path has its target replaced, and an existing file's mode and owner
+        carry over to the new one.
+        
+        Args:
+            path: File to replace
+            data: New contents (bytes)
+            mode: Permissions if path doesn't exist yet
+        """
+        path = os.path.realpath(path)
+        try:
+            existing = os.stat(path)
+        except FileNotFoundError:
+            existing = None
+            
+        # mkstemp opens with O_EXCL under a fresh name, so a stale or
+        # planted temp file is never reused
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.",
+                                        suffix='.tmp', dir=os.path.dirname(path))
+        try:
+            if existing is not None:
+                os.fchmod(fd, existing.st_mode & 0o7777)
+                if (existing.st_uid, existing.st_gid) != (os.geteuid(), os.getegid()):
+                    os.fchown(fd, existing.st_uid, existing.st_gid)
+            else:
+                os.fchmod(fd, mode)
+            # os.write may write less than asked (e.g. a nearly full disk);
+            # keep going so a truncated file is never renamed into place
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        except Exception:
+            os.close(fd)
+            os.unlink(tmp_path)
+            raise
+        os.close(fd)
+        os.rename(tmp_path, path)
         
+    def create_hostapd_config(self):
+        """Create hostapd configuration file"""
         config_path = "/etc/hostapd/hostapd.conf"
         try:
-            with open(config_path, 'w') as f:
-                f.write(config_content)
+            # Holds the WPA passphrase: keep a new file private to root
+            self._write_atomic(config_path, self.hostapd_conf_bytes, mode=0o600)
             self.logger.info(f"Created hostapd config: {config_path}")
             return True
         except Exception as e:
@@ -160,93 +415,188 @@ rsn_pairwise=CCMP
             
     def create_dnsmasq_config(self):
         """Create dnsmasq configuration file"""
-        config_content = f"""interface={self.wifi_interface}
-dhcp-range={self.ap_config['dhcp_start']},{self.ap_config['dhcp_end']},255.255.255.0,24h
-"""
-        
         config_path = "/etc/dnsmasq.conf"
         try:
             # Backup original config
-            self.run_command(f"sudo cp {config_path} {config_path}.backup", check=False)
+            self.run_command_tpl('copy', config_path, f"{config_path}.backup", check=False)
             
-            with open(config_path, 'w') as f:
-                f.write(config_content)
+            self._write_atomic(config_path, self.dnsmasq_conf_bytes)
             self.logger.info(f"Created dnsmasq config: {config_path}")
             return True
         except Exception as e:
             self.logger.error(f"Failed to create dnsmasq config: {e}")
             return False
             
+    def _netlink_set_interface(self, address=None, prefixlen=24, cycle_link=False):
+        """
+        Flush addresses on the WiFi interface and bring it up over netlink
+        
+        Args:
+            address: Optional IPv4 address to add after the flush
+            prefixlen: Prefix length for address
+            cycle_link: Set the link down before bringing it back up
+            
+        Returns:
+            True on success, False if pyroute2 is missing or the kernel refused
+            (e.g. no CAP_NET_ADMIN), in which case callers fall back to `ip`
+        """
+        try:
+            from pyroute2 import IPRoute
+            
+            with IPRoute() as ipr:
+                idx = ipr.link_lookup(ifname=self.wifi_interface)[0]
+                ipr.flush_addr(index=idx)
+                if address:
+                    ipr.addr('add', index=idx, address=address, prefixlen=prefixlen)
+                if cycle_link:
+                    ipr.link('set', index=idx, state='down')
+                ipr.link('set', index=idx, state='up')
+            return True
+        except Exception as e:
+            self.logger.debug(f"Netlink configuration unavailable, using ip: {e}")
+            return False
+            
     def configure_interface_ip(self):
         """Configure static IP for WiFi interface"""
         gateway_ip = self.ap_config['gateway']
         
-        commands = [
-            f"sudo ip addr flush dev {self.wifi_interface}",
-            f"sudo ip addr add {gateway_ip}/24 dev {self.wifi_interface}",
-            f"sudo ip link set {self.wifi_interface} up"
-        ]
-        
-        for cmd in commands:
-            stdout, stderr = self.run_command(cmd, check=False)
+        if not self._netlink_set_interface(address=gateway_ip):
+            commands = [
+                f"ip addr flush dev {self.wifi_interface}",
+                f"ip addr add {gateway_ip}/24 dev {self.wifi_interface}",
+                f"ip link set {self.wifi_interface} up"
+            ]
+            
+            stdout, stderr = self.run_command(commands, check=False)
             if stderr:
-                self.logger.warning(f"Command warning: {cmd} - {stderr}")
+                self.logger.warning(f"Command warning: {'; '.join(commands)} - {stderr}")
                 
+        self.invalidate_iface_cache()
         self.logger.info(f"Configured {self.wifi_interface} with IP {gateway_ip}")
         
     def enable_ip_forwarding(self):
         """Enable IP forwarding for NAT"""
-        self.run_command("sudo sysctl net.ipv4.ip_forward=1")
+        self.run_command_tpl('sysctl', 'net.ipv4.ip_forward=1')
         
         # Make it permanent
         sysctl_conf = "/etc/sysctl.conf"
         try:
-            with open(sysctl_conf, 'r') as f:
-                content = f.read()
-                
-            if "net.ipv4.ip_forward=1" not in content:
-                with open(sysctl_conf, 'a') as f:
+            # Scan line by line and append through the same descriptor;
+            # the scan stops at the first match
+            with open(sysctl_conf, 'r+') as f:
+                if not any("net.ipv4.ip_forward=1" in line for line in f):
                     f.write("\nnet.ipv4.ip_forward=1\n")
                     
         except Exception as e:
             self.logger.error(f"Failed to update sysctl.conf: {e}")
             
+    def _iptc_configure_nat(self, eth_interface):
+        """
+        Load the NAT ruleset through libiptc (python-iptables)
+        
+        Returns:
+            True on success, False if iptc is missing or the kernel refused
+        """
+        try:
+            import iptc
+            
+            nat = iptc.Table(iptc.Table.NAT)
+            filter_table = iptc.Table(iptc.Table.FILTER)
+            nat.autocommit = False
+            filter_table.autocommit = False
+            nat.flush()
+            filter_table.flush()
+            
+            masquerade = iptc.Rule()
+            masquerade.out_interface = eth_interface
+            masquerade.create_target('MASQUERADE')
+            iptc.Chain(nat, 'POSTROUTING').append_rule(masquerade)
+            
+            forward = iptc.Chain(filter_table, 'FORWARD')
+            established = iptc.Rule()
+            established.in_interface = eth_interface
+            established.out_interface = self.wifi_interface
+            established.create_match('state').state = 'RELATED,ESTABLISHED'
+            established.create_target('ACCEPT')
+            forward.append_rule(established)
+            
+            outbound = iptc.Rule()
+            outbound.in_interface = self.wifi_interface
+            outbound.out_interface = eth_interface
+            outbound.create_target('ACCEPT')
+            forward.append_rule(outbound)
+            
+            nat.commit()
+            filter_table.commit()
+            return True
+        except Exception as e:
+            self.logger.debug(f"libiptc configuration unavailable, using iptables-restore: {e}")
+            return False
+            
     def configure_nat(self):
         """Configure iptables for NAT"""
         eth_interface = self.config['network']['ethernet_interface']
         
-        # Clear existing rules
-        self.run_command("sudo iptables -F", check=False)
-        self.run_command("sudo iptables -t nat -F", check=False)
+        # iptables-restore flushes the nat and filter tables and loads the
+        # whole ruleset in one call
+        ruleset = f"""*nat
+-A POSTROUTING -o {eth_interface} -j MASQUERADE
+COMMIT
+*filter
+-A FORWARD -i {eth_interface} -o {self.wifi_interface} -m state --state RELATED,ESTABLISHED -j ACCEPT
+-A FORWARD -i {self.wifi_interface} -o {eth_interface} -j ACCEPT
+COMMIT
+"""
+        
+        if self._iptc_configure_nat(eth_interface):
+            # Rules are already loaded; persist the same ruleset for boot
+            try:
+                self._write_atomic("/etc/iptables.ipv4.nat", ruleset.encode())
+            except Exception as e:
+                self.logger.error(f"Failed to save iptables rules: {e}")
+            return
+            
+        # Load and save iptables rules
+        self.run_command([
+            "iptables-restore",
+            "iptables-save > /etc/iptables.ipv4.nat"
+        ], input=ruleset)
         
-        # Configure NAT
-        nat_commands = [
-            f"sudo iptables -t nat -A POSTROUTING -o {eth_interface} -j MASQUERADE",
-            f"sudo iptables -A FORWARD -i {eth_interface} -o {self.wifi_interface} -m state --state RELATED,ESTABLISHED -j ACCEPT",
-            f"sudo iptables -A FORWARD -i {self.wifi_interface} -o {eth_interface} -j ACCEPT"
-        ]
+    async def _systemctl_parallel(self, action, services):
+        """
+        Run `sudo systemctl <action> <service>` for all services concurrently
         
-        for cmd in nat_commands:
-            self.run_command(cmd)
+        Returns:
+            List of (returncode, stderr) tuples in the order of services
+        """
+        async def run(service):
+            process = await asyncio.create_subprocess_exec(
+                *self._command_argv('systemctl', action, service),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            _, stderr = await process.communicate()
+            return process.returncode, stderr.decode().strip()
             
-        # Save iptables rules
-        self.run_command("sudo iptables-save > /etc/iptables.ipv4.nat", check=False)
+        return await asyncio.gather(*(run(service) for service in services))
         
     def start_ap_services(self):
         """Start AP services"""
         services = ['hostapd', 'dnsmasq']
         
-        for service in services:
-            self.logger.info(f"Starting {service}")
-            stdout, stderr = self.run_command(f"sudo systemctl start {service}")
-            
-            if stderr:
+        # The units are independent, so start them side by side
+        self.logger.info(f"Starting {', '.join(services)}")
+        results = asyncio.run(self._systemctl_parallel('start', services))
+        self._service_states.clear()
+        
+        for service, (returncode, stderr) in zip(services, results):
+            if returncode != 0 or stderr:
                 self.logger.error(f"Failed to start {service}: {stderr}")
                 return False
                 
-            # Enable service to start on boot
-            self.run_command(f"sudo systemctl enable {service}", check=False)
-            
+        # Enable services to start on boot
+        self.run_command_tpl('systemctl', 'enable', *services, check=False)
+        
         self.logger.info("AP mode enabled successfully")
         return True
         
@@ -254,23 +604,31 @@ dhcp-range={self.ap_config['dhcp_start']},{self.ap_config['dhcp_end']},255.255.2
         """Disable AP mode and return to normal WiFi"""
         self.logger.info("Disabling AP mode...")
         
-        # Stop AP services
-        services = ['hostapd', 'dnsmasq']
-        for service in services:
-            self.run_command(f"sudo systemctl stop {service}", check=False)
-            self.run_command(f"sudo systemctl disable {service}", check=False)
-            
-        # Clear iptables rules
-        self.run_command("sudo iptables -F", check=False)
-        self.run_command("sudo iptables -t nat -F", check=False)
+        services = 'hostapd dnsmasq'
         
-        # Reset WiFi interface
-        self.run_command(f"sudo ip addr flush dev {self.wifi_interface}", check=False)
-        self.run_command(f"sudo ip link set {self.wifi_interface} down", check=False)
-        self.run_command(f"sudo ip link set {self.wifi_interface} up", check=False)
+        # Stop AP services (disabling them in one systemd job) and clear
+        # iptables rules before touching the interface they hold
+        self.run_command([
+            f"systemctl disable --now {services}",
+            "iptables -F",
+            "iptables -t nat -F"
+        ], check=False)
         
+        # Reset WiFi interface (over netlink when possible)
+        commands = []
+        if not self._netlink_set_interface(cycle_link=True):
+            commands += [
+                f"ip addr flush dev {self.wifi_interface}",
+                f"ip link set {self.wifi_interface} down",
+                f"ip link set {self.wifi_interface} up"
+            ]
+            
         # Restart network manager or dhcpcd
-        self.run_command("sudo systemctl restart dhcpcd", check=False)
+        commands.append("systemctl restart dhcpcd")
+        
+        self.run_command(commands, check=False)
+        self.invalidate_iface_cache()
+        self._service_states.clear()
         
         self.logger.info("AP mode disabled successfully")
         return True
@@ -279,17 +637,17 @@ dhcp-range={self.ap_config['dhcp_start']},{self.ap_config['dhcp_end']},255.255.2
         """Get current AP status"""
         try:
             # Check if hostapd is running
-            hostapd_status = self.run_command("sudo systemctl is-active hostapd", check=False)[0]
+            hostapd_status = self.get_service_state('hostapd')
             
             # Check if dnsmasq is running
-            dnsmasq_status = self.run_command("sudo systemctl is-active dnsmasq", check=False)[0]
+            dnsmasq_status = self.get_service_state('dnsmasq')
             
             # Get connected clients (if AP is active)
             clients = []
             if hostapd_status == "active":
                 clients = self.get_connected_clients()
                 
-            interface_status = self.get_interface_status(self.wifi_interface)
+            interface_status = self.get_interface_status(self.wifi_interface, fetch_addrs=False)
             
             return {
                 'ap_enabled': hostapd_status == "active" and dnsmasq_status == "active",
@@ -308,27 +666,24 @@ dhcp-range={self.ap_config['dhcp_start']},{self.ap_config['dhcp_end']},255.255.2
         """Get list of connected AP clients"""
         clients = []
         try:
-            # Parse DHCP leases
-            lease_file = "/var/lib/dhcp/dhcpcd.leases"
-            if os.path.exists(lease_file):
-                with open(lease_file, 'r') as f:
-                    # Parse DHCP lease file for connected clients
-                    pass
-                    
-            # Alternative: parse ARP table
-            arp_output, _ = self.run_command("arp -a", check=False)
-            if arp_output:
-                for line in arp_output.split('\n'):
-                    if self.ap_config['ip_range'].split('/')[0][:-1] in line:
-                        # Extract client info from ARP table
-                        parts = line.split()
-                        if len(parts) >= 4:
-                            clients.append({
-                                'ip': parts[1].strip('()'),
-                                'mac': parts[3],
-                                'interface': parts[5] if len(parts) > 5 else 'unknown'
-                            })
-                            
+            # Parse the kernel ARP table directly
+            # Columns: IP address, HW type, Flags, HW address, Mask, Device
+            ap_network = self.ap_network
+            lines = self._read_small_file(ARP_TABLE_PATH).splitlines()
+            for line in lines[1:]:  # Skip header
+                parts = line.split()
+                if len(parts) < 6:
+                    continue
+                ip, _, flags, mac, _, device = parts[:6]
+                # Flags 0x0 marks an incomplete (unresolved) entry
+                if (device == self.wifi_interface and flags != '0x0'
+                        and ipaddress.ip_address(ip) in ap_network):
+                    clients.append({
+                        'ip': ip,
+                        'mac': mac,
+                        'interface': device
+                    })
+                        
         except Exception as e:
             self.logger.error(f"Error getting connected clients: {e}")
             
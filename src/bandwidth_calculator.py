@@ -6,10 +6,107 @@ Calculate raw and compressed video bandwidth requirements
 
 import argparse
 import json
-import yaml
 import math
+import numpy as np
+from dataclasses import dataclass
 from datetime import datetime
 
+# Optional fast JSON encoder
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Unit conversion constants
+_KILO = 1000
+_MEGA = 1000 * 1000
+_GIGA = 1000 * 1000 * 1000
+_GIB = 1 << 30
+_SEC_PER_HOUR = 3600
+_SEC_PER_DAY = 86400
+
+# Bits per pixel for the default pixel format (bit_depth=8, channels=3)
+_BITS_PER_PIXEL_8BIT_RGB = 24
+
+# Output keys, in the order of the pre-scaled factor tuples below
+_BANDWIDTH_KEYS = ('bits_per_second', 'bytes_per_second', 'kbps', 'mbps', 'gbps')
+_STORAGE_KEYS = ('bytes_per_hour', 'bytes_per_day', 'gb_per_hour', 'gb_per_day', 'tb_per_day')
+
+def _scaled_factors(ratio):
+    """Return (bandwidth, storage) factors that map raw bits/s to each output key"""
+    bandwidth = (ratio, ratio / 8, ratio / _KILO, ratio / _MEGA, ratio / _GIGA)
+    storage = (
+        ratio * _SEC_PER_HOUR / 8,
+        ratio * _SEC_PER_DAY / 8,
+        ratio * _SEC_PER_HOUR / 8 / _GIB,
+        ratio * _SEC_PER_DAY / 8 / _GIB,
+        ratio * _SEC_PER_DAY / 8 / _GIB / 1024
+    )
+    return bandwidth, storage
+
+@dataclass
+class RawBandwidth:
+    """Raw (uncompressed) bandwidth of one video configuration"""
+    # Spelled out rather than dataclass(slots=True), which needs Python 3.10
+    __slots__ = ('width', 'height', 'fps', 'bit_depth', 'channels',
+                 'bits_per_pixel', 'bits_per_frame', 'bits_per_second')
+    
+    width: int
+    height: int
+    fps: float
+    bit_depth: int
+    channels: int
+    bits_per_pixel: int
+    bits_per_frame: int
+    bits_per_second: float
+    
+    def to_dict(self):
+        """Expand into the nested bandwidth/storage breakdown used for output"""
+        bits_per_second = self.bits_per_second
+        
+        # Convert to various units
+        bytes_per_second = bits_per_second / 8
+        kbps = bits_per_second / _KILO
+        mbps = bits_per_second / _MEGA
+        gbps = bits_per_second / _GIGA
+        
+        # Storage calculations (per hour, per day)
+        bytes_per_hour = bytes_per_second * _SEC_PER_HOUR
+        bytes_per_day = bytes_per_second * _SEC_PER_DAY
+        
+        gb_per_hour = bytes_per_hour / _GIB
+        gb_per_day = bytes_per_day / _GIB
+        tb_per_day = gb_per_day / 1024
+        
+        return {
+            'resolution': f"{self.width}x{self.height}",
+            'fps': self.fps,
+            'bit_depth': self.bit_depth,
+            'channels': self.channels,
+            'bits_per_pixel': self.bits_per_pixel,
+            'bits_per_frame': self.bits_per_frame,
+            'bandwidth': {
+                'bits_per_second': bits_per_second,
+                'bytes_per_second': bytes_per_second,
+                'kbps': round(kbps, 2),
+                'mbps': round(mbps, 2),
+                'gbps': round(gbps, 4)
+            },
+            'storage': {
+                'bytes_per_hour': bytes_per_hour,
+                'bytes_per_day': bytes_per_day,
+                'gb_per_hour': round(gb_per_hour, 2),
+                'gb_per_day': round(gb_per_day, 2),
+                'tb_per_day': round(tb_per_day, 4)
+            }
+        }
+
+def _dumps_json(obj):
+    """Serialize results as indented JSON, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
+
 class BandwidthCalculator:
     def __init__(self):
         self.common_resolutions = {
@@ -34,9 +131,16 @@ class BandwidthCalculator:
             'h265_high': 0.005,  # 200:1 compression
         }
         
-    def calculate_raw_bandwidth(self, width, height, fps, bit_depth=8, channels=3):
+        # Per-compression label and pre-scaled factors, so applying a
+        # compression is one multiply per output key
+        self._comp_cache = {
+            name: (f"{1/ratio:.0f}:1", ratio) + _scaled_factors(ratio)
+            for name, ratio in self.compression_ratios.items()
+        }
+        
+    def compute_raw_bandwidth(self, width, height, fps, bit_depth=8, channels=3):
         """
-        Calculate raw video bandwidth requirements
+        Calculate raw video bandwidth as a compact RawBandwidth record
         
         Args:
             width: Video width in pixels
@@ -46,10 +150,13 @@ class BandwidthCalculator:
             channels: Color channels (3 for RGB, 1 for grayscale)
             
         Returns:
-            Dictionary with bandwidth calculations
+            RawBandwidth instance (use to_dict() for the full breakdown)
         """
-        # Calculate bits per pixel
-        bits_per_pixel = bit_depth * channels
+        # Calculate bits per pixel (8-bit RGB is by far the common case)
+        if bit_depth == 8 and channels == 3:
+            bits_per_pixel = _BITS_PER_PIXEL_8BIT_RGB
+        else:
+            bits_per_pixel = bit_depth * channels
         
         # Calculate bits per frame
         bits_per_frame = width * height * bits_per_pixel
@@ -57,81 +164,59 @@ class BandwidthCalculator:
         # Calculate bits per second
         bits_per_second = bits_per_frame * fps
         
-        # Convert to various units
-        bytes_per_second = bits_per_second / 8
-        kbps = bits_per_second / 1000
-        mbps = bits_per_second / (1000 * 1000)
-        gbps = bits_per_second / (1000 * 1000 * 1000)
+        return RawBandwidth(width, height, fps, bit_depth, channels,
+                            bits_per_pixel, bits_per_frame, bits_per_second)
         
-        # Storage calculations (per hour, per day)
-        bytes_per_hour = bytes_per_second * 3600
-        bytes_per_day = bytes_per_hour * 24
-        
-        gb_per_hour = bytes_per_hour / (1024 * 1024 * 1024)
-        gb_per_day = bytes_per_day / (1024 * 1024 * 1024)
-        tb_per_day = gb_per_day / 1024
+    def calculate_raw_bandwidth(self, width, height, fps, bit_depth=8, channels=3):
+        """
+        Calculate raw video bandwidth requirements
         
-        return {
-            'resolution': f"{width}x{height}",
-            'fps': fps,
-            'bit_depth': bit_depth,
-            'channels': channels,
-            'bits_per_pixel': bits_per_pixel,
-            'bits_per_frame': bits_per_frame,
-            'bandwidth': {
-                'bits_per_second': bits_per_second,
-                'bytes_per_second': bytes_per_second,
-                'kbps': round(kbps, 2),
-                'mbps': round(mbps, 2),
-                'gbps': round(gbps, 4)
-            },
-            'storage': {
-                'bytes_per_hour': bytes_per_hour,
-                'bytes_per_day': bytes_per_day,
-                'gb_per_hour': round(gb_per_hour, 2),
-                'gb_per_day': round(gb_per_day, 2),
-                'tb_per_day': round(tb_per_day, 4)
-            }
-        }
+        Args:
+            width: Video width in pixels
+            height: Video height in pixels
+            fps: Frames per second
+            bit_depth: Bits per channel (usually 8)
+            channels: Color channels (3 for RGB, 1 for grayscale)
+            
+        Returns:
+            Dictionary with bandwidth calculations
+        """
+        return self.compute_raw_bandwidth(width, height, fps, bit_depth, channels).to_dict()
         
     def calculate_compressed_bandwidth(self, raw_bandwidth, compression_type='h264_medium'):
         """
         Calculate compressed video bandwidth
         
         Args:
-            raw_bandwidth: Raw bandwidth calculation result
+            raw_bandwidth: Raw bandwidth calculation result (RawBandwidth or dict)
             compression_type: Type of compression to apply
             
         Returns:
             Dictionary with compressed bandwidth calculations
         """
-        if compression_type not in self.compression_ratios:
+        if compression_type not in self._comp_cache:
             raise ValueError(f"Unknown compression type: {compression_type}")
             
-        ratio = self.compression_ratios[compression_type]
+        label, ratio, bandwidth_factors, storage_factors = self._comp_cache[compression_type]
+        if isinstance(raw_bandwidth, RawBandwidth):
+            bits_per_second = raw_bandwidth.bits_per_second
+        else:
+            bits_per_second = raw_bandwidth['bandwidth']['bits_per_second']
         
         compressed = {
             'compression_type': compression_type,
-            'compression_ratio': f"{1/ratio:.0f}:1",
+            'compression_ratio': label,
             'compression_factor': ratio,
-            'bandwidth': {},
-            'storage': {}
+            'bandwidth': {
+                key: round(bits_per_second * factor, 4)
+                for key, factor in zip(_BANDWIDTH_KEYS, bandwidth_factors)
+            },
+            'storage': {
+                key: round(bits_per_second * factor, 4)
+                for key, factor in zip(_STORAGE_KEYS, storage_factors)
+            }
         }
         
-        # Apply compression to bandwidth
-        for key, value in raw_bandwidth['bandwidth'].items():
-            if isinstance(value, (int, float)):
-                compressed['bandwidth'][key] = round(value * ratio, 4)
-            else:
-                compressed['bandwidth'][key] = value
-                
-        # Apply compression to storage
-        for key, value in raw_bandwidth['storage'].items():
-            if isinstance(value, (int, float)):
-                compressed['storage'][key] = round(value * ratio, 4)
-            else:
-                compressed['storage'][key] = value
-                
         return compressed
         
     def get_resolution_specs(self, resolution_name):
@@ -142,6 +227,65 @@ class BandwidthCalculator:
         else:
             raise ValueError(f"Unknown resolution: {resolution_name}")
             
+    def _resolve_dims(self, config):
+        """Return (width, height) for a stream/configuration entry"""
+        if 'resolution' not in config:
+            return config['width'], config['height']
+            
+        resolution = config['resolution']
+        if resolution in self.common_resolutions:
+            return self.common_resolutions[resolution]
+            
+        # Try to parse WxH format
+        try:
+            width, height = map(int, resolution.split('x'))
+        except:
+            raise ValueError(f"Invalid resolution format: {resolution}")
+        return width, height
+        
+    def _vector_bandwidth(self, streams):
+        """
+        Compute bandwidth for a list of stream configurations in one vectorized pass
+        
+        Args:
+            streams: List of stream configurations
+            
+        Returns:
+            Tuple of (dims, bits_per_second, mbps, gb_per_day) where dims is a list
+            of (width, height) tuples and the rest are NumPy arrays, one entry per stream
+        """
+        dims = [self._resolve_dims(stream) for stream in streams]
+        ratios = []
+        
+        for stream in streams:
+            # Resolve compression factor (raw when not specified)
+            compression_type = stream.get('compression', 'raw')
+            if compression_type not in self._comp_cache:
+                raise ValueError(f"Unknown compression type: {compression_type}")
+            ratios.append(self._comp_cache[compression_type][1])
+            
+        # Build structure-of-arrays views of the stream list
+        count = len(streams)
+        widths = np.fromiter((w for w, _ in dims), dtype=np.float64, count=count)
+        heights = np.fromiter((h for _, h in dims), dtype=np.float64, count=count)
+        fps = np.fromiter((s['fps'] for s in streams), dtype=np.float64, count=count)
+        ratios = np.asarray(ratios, dtype=np.float64)
+        
+        # Fast path: skip the per-stream pixel format arrays when every
+        # stream uses the default 8-bit RGB
+        if all(s.get('bit_depth', 8) == 8 and s.get('channels', 3) == 3 for s in streams):
+            bits_per_pixel = _BITS_PER_PIXEL_8BIT_RGB
+        else:
+            bit_depth = np.fromiter((s.get('bit_depth', 8) for s in streams), dtype=np.float64, count=count)
+            channels = np.fromiter((s.get('channels', 3) for s in streams), dtype=np.float64, count=count)
+            bits_per_pixel = bit_depth * channels
+            
+        bits_per_second = widths * heights * bits_per_pixel * fps * ratios
+        mbps = bits_per_second * (1 / _MEGA)
+        gb_per_day = bits_per_second * (_SEC_PER_DAY / 8 / _GIB)
+        
+        return dims, bits_per_second, mbps, gb_per_day
+        
     def calculate_multiple_streams(self, streams):
         """
         Calculate bandwidth for multiple camera streams
@@ -152,58 +296,26 @@ class BandwidthCalculator:
         Returns:
             Dictionary with total bandwidth calculations
         """
+        dims, bits_per_second, mbps, gb_per_day = self._vector_bandwidth(streams)
+        
         total_bandwidth = {
-            'bits_per_second': 0,
-            'mbps': 0,
-            'gb_per_day': 0
+            'bits_per_second': float(bits_per_second.sum()),
+            'mbps': round(float(mbps.sum()), 4),
+            'gb_per_day': round(float(gb_per_day.sum()), 4)
         }
         
         stream_details = []
         
-        for i, stream in enumerate(streams):
-            # Parse resolution
-            if 'resolution' in stream:
-                if stream['resolution'] in self.common_resolutions:
-                    width, height = self.common_resolutions[stream['resolution']]
-                else:
-                    # Try to parse WxH format
-                    try:
-                        width, height = map(int, stream['resolution'].split('x'))
-                    except:
-                        raise ValueError(f"Invalid resolution format: {stream['resolution']}")
-            else:
-                width = stream['width']
-                height = stream['height']
-            
-            # Calculate raw bandwidth
-            raw = self.calculate_raw_bandwidth(
-                width, 
-                height, 
-                stream['fps'],
-                stream.get('bit_depth', 8),
-                stream.get('channels', 3)
-            )
-            
-            # Calculate compressed bandwidth if specified
-            if 'compression' in stream:
-                compressed = self.calculate_compressed_bandwidth(raw, stream['compression'])
-                bandwidth_to_use = compressed
-            else:
-                bandwidth_to_use = raw
-                
-            # Add to totals
-            total_bandwidth['bits_per_second'] += bandwidth_to_use['bandwidth']['bits_per_second']
-            total_bandwidth['mbps'] += bandwidth_to_use['bandwidth']['mbps']
-            total_bandwidth['gb_per_day'] += bandwidth_to_use['storage']['gb_per_day']
-            
+        for i, (stream, (width, height), stream_mbps, stream_gb) in enumerate(
+                zip(streams, dims, mbps.tolist(), gb_per_day.tolist())):
             stream_details.append({
                 'stream_id': i + 1,
                 'name': stream.get('name', f'Stream {i + 1}'),
                 'resolution': f"{width}x{height}",
                 'fps': stream['fps'],
                 'compression': stream.get('compression', 'raw'),
-                'bandwidth_mbps': bandwidth_to_use['bandwidth']['mbps'],
-                'storage_gb_per_day': bandwidth_to_use['storage']['gb_per_day']
+                'bandwidth_mbps': round(stream_mbps, 4),
+                'storage_gb_per_day': round(stream_gb, 4)
             })
             
         return {
@@ -273,23 +385,14 @@ class BandwidthCalculator:
             }
         }
         
-        for config in configurations:
-            # Parse resolution
-            if 'resolution' in config:
-                if config['resolution'] in self.common_resolutions:
-                    width, height = self.common_resolutions[config['resolution']]
-                else:
-                    # Try to parse WxH format
-                    try:
-                        width, height = map(int, config['resolution'].split('x'))
-                    except:
-                        raise ValueError(f"Invalid resolution format: {config['resolution']}")
-            else:
-                width = config['width']
-                height = config['height']
-                
+        # Resolve all resolutions up front so the loop only does numerics
+        dims = [self._resolve_dims(config) for config in configurations]
+        mbps_values = []
+        gb_values = []
+        
+        for config, (width, height) in zip(configurations, dims):
             # Calculate raw bandwidth
-            raw = self.calculate_raw_bandwidth(
+            raw = self.compute_raw_bandwidth(
                 width, height, config['fps'],
                 config.get('bit_depth', 8),
                 config.get('channels', 3)
@@ -297,7 +400,7 @@ class BandwidthCalculator:
             
             config_result = {
                 'name': config.get('name', f"{width}x{height}@{config['fps']}fps"),
-                'raw_bandwidth': raw
+                'raw_bandwidth': raw.to_dict()
             }
             
             # Calculate compressed versions
@@ -308,22 +411,21 @@ class BandwidthCalculator:
                 compressed = self.calculate_compressed_bandwidth(raw, comp)
                 config_result['compressed_options'].append(compressed)
                 
-                # Update summary ranges
-                mbps = compressed['bandwidth']['mbps']
-                gb_per_day = compressed['storage']['gb_per_day']
+                # Collect values for the summary ranges
+                mbps_values.append(compressed['bandwidth']['mbps'])
+                gb_values.append(compressed['storage']['gb_per_day'])
                 
-                if mbps < report['summary']['bandwidth_range_mbps'][0]:
-                    report['summary']['bandwidth_range_mbps'][0] = mbps
-                if mbps > report['summary']['bandwidth_range_mbps'][1]:
-                    report['summary']['bandwidth_range_mbps'][1] = mbps
-                    
-                if gb_per_day < report['summary']['storage_range_gb_per_day'][0]:
-                    report['summary']['storage_range_gb_per_day'][0] = gb_per_day
-                if gb_per_day > report['summary']['storage_range_gb_per_day'][1]:
-                    report['summary']['storage_range_gb_per_day'][1] = gb_per_day
-                    
             report['configurations'].append(config_result)
             
+        # Compute summary ranges once over all compressed options
+        if mbps_values:
+            report['summary']['bandwidth_range_mbps'] = [
+                float(np.min(mbps_values)), float(np.max(mbps_values))
+            ]
+            report['summary']['storage_range_gb_per_day'] = [
+                float(np.min(gb_values)), float(np.max(gb_values))
+            ]
+            
         return report
 
 def main():
@@ -357,9 +459,16 @@ def main():
         return
         
     if args.config_file:
+        # Imported lazily so the listing and single-calculation paths skip it
+        import yaml
+        try:
+            from yaml import CSafeLoader as SafeLoader
+        except ImportError:
+            from yaml import SafeLoader
+        
         # Load configuration from file
         with open(args.config_file, 'r') as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=SafeLoader)
             
         if 'streams' in config:
             result = calc.calculate_multiple_streams(config['streams'])
@@ -397,10 +506,10 @@ def main():
     # Output results
     if args.output:
         with open(args.output, 'w') as f:
-            json.dump(result, f, indent=2)
+            f.write(_dumps_json(result))
         print(f"Results saved to {args.output}")
     else:
-        print(json.dumps(result, indent=2))
+        print(_dumps_json(result))
 
 if __name__ == "__main__":
     main()
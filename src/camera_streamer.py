@@ -12,18 +12,205 @@ import argparse
 import logging
 import threading
 import subprocess
-from datetime import datetime, timedelta
+import copy
+import fcntl
+import struct
+from datetime import datetime
 from collections import deque
+from functools import cached_property, lru_cache
 import yaml
 import cv2
 import numpy as np
 import psutil
 from pathlib import Path
+from perf_kernels import downsample_rows
+
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+try:
+    from numba import njit
+except ImportError:
+    # Without Numba the ring kernels below run as plain Python
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+try:
+    from linuxpy.video.device import Device as V4L2Device, VideoCapture as V4L2Stream, BufferType
+    from linuxpy.video.device import Memory as V4L2Memory
+except ImportError:
+    V4L2Device = None
 
 # Auto-detect config path
 SCRIPT_DIR = Path(__file__).parent
 CONFIG_PATH = SCRIPT_DIR.parent / "config" / "settings.yaml"
 
+# Frames kept for FPS calculation, and the most recent of those used for bandwidth
+FRAME_WINDOW = 100
+BANDWIDTH_WINDOW = 10
+
+# FPS and bandwidth stats are refreshed once per this many analyzed frames
+STATS_EVERY_N_FRAMES = 16
+
+# Frames buffered between the capture and analysis threads
+FRAME_RING_SIZE = 4
+
+# V4L2 ioctls used to probe devices without opening a capture stream.
+# ioctl numbers encode the struct size; v4l2_format's union is pointer
+# aligned, so it is 4 bytes larger on 64-bit kernels.
+def _v4l2_iowr(nr, size, read_only=False):
+    direction = 2 if read_only else 3  # _IOC_READ / _IOC_READ|_IOC_WRITE
+    return (direction << 30) | (size << 16) | (ord('V') << 8) | nr
+
+V4L2_CAPABILITY_SIZE = 104
+V4L2_FORMAT_SIZE = 208 if struct.calcsize('P') == 8 else 204
+V4L2_FORMAT_UNION_OFFSET = V4L2_FORMAT_SIZE - 200
+V4L2_STREAMPARM_SIZE = 204
+V4L2_FMTDESC_SIZE = 64
+VIDIOC_QUERYCAP = _v4l2_iowr(0, V4L2_CAPABILITY_SIZE, read_only=True)
+VIDIOC_ENUM_FMT = _v4l2_iowr(2, V4L2_FMTDESC_SIZE)
+VIDIOC_G_FMT = _v4l2_iowr(4, V4L2_FORMAT_SIZE)
+VIDIOC_G_PARM = _v4l2_iowr(21, V4L2_STREAMPARM_SIZE)
+V4L2_BUF_TYPE_VIDEO_CAPTURE = 1
+V4L2_CAP_VIDEO_CAPTURE = 0x1
+V4L2_CAP_DEVICE_CAPS = 0x80000000
+
+# Driver buffers mmap'd by the direct V4L2 backend: enough for a full
+# capture ring, the frame under analysis, the one being captured and two
+# left queued so the driver never runs dry
+V4L2_BUFFER_COUNT = FRAME_RING_SIZE + 4
+
+# Camera bandwidth history ring: one row per analyzed frame
+BANDWIDTH_HISTORY_SIZE = 3600
+BANDWIDTH_HISTORY_DTYPE = np.dtype([
+    ('timestamp', 'f8'),  # Epoch seconds
+    ('fps', 'f8'),
+    ('bandwidth_mbps', 'f8'),
+    ('raw_bandwidth_mbps', 'f8'),
+    ('frame_size', 'i8')
+])
+
+@njit(cache=True)
+def _push_frame(frame_times, frame_sizes, head, filled, recent_sum, timestamp, size):
+    """
+    Write one frame into the timing/size rings
+    
+    Keeps recent_sum equal to the sum of the last BANDWIDTH_WINDOW sizes by
+    dropping the size leaving that window and adding the new one.
+    
+    Returns:
+        Updated (head, filled, recent_sum)
+    """
+    window = frame_times.shape[0]
+    if filled >= BANDWIDTH_WINDOW:
+        recent_sum -= frame_sizes[(head - BANDWIDTH_WINDOW) % window]
+    recent_sum += size
+    frame_times[head] = timestamp
+    frame_sizes[head] = size
+    return (head + 1) % window, min(filled + 1, window), recent_sum
+    
+    
+@njit(cache=True)
+def _window_fps(frame_times, head, filled, now):
+    """FPS over the frames in the timing ring, or 0.0 if it cannot be measured yet"""
+    if filled < 2:
+        return 0.0
+    # Once full, the next write slot holds the oldest entry
+    oldest = frame_times[head] if filled == frame_times.shape[0] else frame_times[0]
+    window_ns = now - oldest
+    if window_ns <= 0:
+        return 0.0
+    return (filled - 1) * 1e9 / window_ns
+    
+    
+@lru_cache(maxsize=4)
+def _load_yaml(config_path, mtime):
+    """Parse a YAML file; cached on (path, mtime) so edits are picked up"""
+    with open(config_path, 'r') as file:
+        return yaml.load(file, Loader=YamlLoader)
+        
+        
+class V4L2Capture:
+    """
+    Minimal cv2.VideoCapture stand-in reading MJPEG frames from V4L2 MMAP buffers
+    
+    read() returns a 1-D uint8 view straight into the dequeued driver buffer,
+    so frames are never copied. The buffer stays dequeued until requeue() is
+    called with that frame; the streaming loops do so once a frame has been
+    analyzed or evicted from the capture ring.
+    """
+    
+    def __init__(self, device_path, buffers=V4L2_BUFFER_COUNT):
+        self._device = V4L2Device(device_path, blocking=True)
+        self._device.open()
+        self._stream = V4L2Stream(self._device, size=buffers)
+        self._views = None  # One full-length array per mmap'd buffer
+        self._dequeued = {}  # id(frame) -> (frame, buffer index)
+        
+    def isOpened(self):
+        return not self._device.closed
+        
+    def set(self, prop, value):
+        """Apply the subset of capture properties V4L2 exposes directly"""
+        if self._views is not None:
+            return False
+        capture = BufferType.VIDEO_CAPTURE
+        if prop in (cv2.CAP_PROP_FRAME_WIDTH, cv2.CAP_PROP_FRAME_HEIGHT):
+            fmt = self._device.get_format(capture)
+            width = int(value) if prop == cv2.CAP_PROP_FRAME_WIDTH else fmt.width
+            height = int(value) if prop == cv2.CAP_PROP_FRAME_HEIGHT else fmt.height
+            self._device.set_format(capture, width, height, 'MJPG')
+            return True
+        if prop == cv2.CAP_PROP_FPS:
+            self._device.set_fps(capture, value)
+            return True
+        # FOURCC is always MJPG; buffer count and RGB conversion are fixed
+        return False
+        
+    def get(self, prop):
+        capture = BufferType.VIDEO_CAPTURE
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return self._device.get_format(capture).width
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return self._device.get_format(capture).height
+        if prop == cv2.CAP_PROP_FPS:
+            return float(self._device.get_fps(capture))
+        if prop == cv2.CAP_PROP_FOURCC:
+            return float(cv2.VideoWriter_fourcc(*'MJPG'))
+        return 0.0
+        
+    def read(self):
+        """Block on the next driver buffer (DQBUF) and return it as (ret, frame)"""
+        try:
+            if self._views is None:
+                self._stream.open()
+                self._views = [np.frombuffer(mm, dtype=np.uint8) for mm in self._stream.buffer.buffers]
+            buff = self._device.dequeue_buffer(BufferType.VIDEO_CAPTURE, V4L2Memory.MMAP)
+            frame = self._views[buff.index][:buff.bytesused]
+            self._dequeued[id(frame)] = (frame, buff.index)
+            return True, frame
+        except OSError:
+            return False, None
+            
+    def requeue(self, frame):
+        """Hand the driver buffer behind a frame from read() back to the driver (QBUF)"""
+        entry = self._dequeued.pop(id(frame), None)
+        if entry is not None:
+            self._device.enqueue_buffer(BufferType.VIDEO_CAPTURE, V4L2Memory.MMAP, 0, entry[1])
+            
+    def release(self):
+        self._dequeued.clear()
+        self._views = None
+        try:
+            self._stream.close()
+        except BufferError:
+            # A frame view is still alive; its mapping goes when it is dropped
+            pass
+        self._device.close()
+        
+        
 class CameraStreamer:
     """
     Camera streaming and recording system for Radxa Rock5B+
@@ -34,11 +221,16 @@ class CameraStreamer:
         Initialize Camera Streamer
         
         Args:
-            config_path: Path to configuration file (auto-detected if None)
+            config_path: Path to configuration file (auto-detected if None),
+                or an already-parsed config dict
         """
-        if config_path is None:
-            config_path = str(CONFIG_PATH)
-        self.config = self.load_config(config_path)
+        if isinstance(config_path, dict):
+            # Parsed once by the caller; copy so changes here stay local
+            self.config = copy.deepcopy(config_path)
+        else:
+            if config_path is None:
+                config_path = str(CONFIG_PATH)
+            self.config = self.load_config(config_path)
         self.camera_config = self.config['camera']
         self.logger = self.setup_logging()
         
@@ -47,15 +239,54 @@ class CameraStreamer:
         self.streaming = False
         self.recording = False
         self.stream_thread = None
+        self.capture_thread = None
         self.rtsp_process = None
         
+        # Capture -> analysis hand-off: single producer, single consumer.
+        # deque append/popleft are atomic under the GIL, so no lock is needed;
+        # when analysis falls behind, the capture loop drops the oldest frame.
+        self._frame_ring = deque(maxlen=FRAME_RING_SIZE)
+        self._frame_ready = threading.Event()
+        
         # Performance monitoring
         self.frame_count = 0
         self.start_time = None
-        self.frame_times = deque(maxlen=100)  # Last 100 frame timestamps
-        self.frame_sizes = deque(maxlen=100)  # Last 100 frame sizes
+        # Fixed-size rings of the last FRAME_WINDOW frame timestamps/sizes,
+        # with a running sum over the last BANDWIDTH_WINDOW sizes (see _push_frame)
+        self.frame_times = np.zeros(FRAME_WINDOW, dtype=np.int64)  # time.monotonic_ns() values
+        self.frame_sizes = np.zeros(FRAME_WINDOW, dtype=np.int64)
+        self._frame_head = 0  # Next slot to write
+        self._frame_filled = 0  # Valid slots
+        self._recent_size_sum = 0
+        self._stats_tick = 0
+        self._analyzed_count = 0  # Frames seen by analyze_frame; frame_count counts captures
+        # Maps monotonic frame times to wall-clock time for the history
+        self._epoch_offset_ns = time.time_ns() - time.monotonic_ns()
         self.dropped_frames = 0
-        self.bandwidth_history = deque(maxlen=3600)  # 1 hour of bandwidth data
+        
+        # Bandwidth history: preallocated ring of BANDWIDTH_HISTORY_SIZE rows
+        # (1 hour of bandwidth data), written in place with no per-frame objects
+        self.bandwidth_history = np.zeros(BANDWIDTH_HISTORY_SIZE, dtype=BANDWIDTH_HISTORY_DTYPE)
+        self._bw_head = 0  # Next row to write
+        self._bw_count = 0  # Valid rows
+        
+        # Motion detection: MOG2 background subtraction on every Nth
+        # row/column, with sample and mask buffers allocated on the first frame
+        self._motion_step = self.camera_config.get('motion_sample_step', 8)
+        self._bg = cv2.createBackgroundSubtractorMOG2(history=30, varThreshold=16, detectShadows=False)
+        self._sample_buf = None
+        self._fg_buf = None
+        
+        # Mean brightness, recomputed every brightness_every_n_frames frames
+        self._brightness_every = max(self.camera_config.get('brightness_every_n_frames', 15), 1)
+        self._mean_brightness = None
+        
+        # MJPEG frames arrive still encoded; decode them only when needed
+        self._decode_for_analysis = self.camera_config.get('decode_for_analysis', False)
+        self._frame_dims = (self.camera_config['video']['width'], self.camera_config['video']['height'])
+        
+        # Raw bandwidth of the configured format, until the camera reports its own
+        raw_bandwidth = self.calculate_raw_bandwidth(*self._frame_dims, self.camera_config['video']['fps'])
         
         # Statistics
         self.stats = {
@@ -67,14 +298,15 @@ class CameraStreamer:
             'dropped_frames': 0,
             'total_frames': 0,
             'bandwidth_mbps': 0,
-            'raw_bandwidth_mbps': 0
+            'raw_bandwidth_mbps': round(raw_bandwidth, 3)
         }
         
     def load_config(self, config_path):
         """Load configuration from YAML file"""
         try:
-            with open(config_path, 'r') as file:
-                return yaml.safe_load(file)
+            config_path = os.path.abspath(config_path)
+            # Copy so instances never share (and mutate) the cached dict
+            return copy.deepcopy(_load_yaml(config_path, os.path.getmtime(config_path)))
         except Exception as e:
             print(f"Error loading config: {e}")
             sys.exit(1)
@@ -87,6 +319,69 @@ class CameraStreamer:
         )
         return logging.getLogger(__name__)
         
+    def _query_v4l2_device(self, device_path):
+        """
+        Probe a V4L2 node with VIDIOC_QUERYCAP, VIDIOC_G_FMT and VIDIOC_G_PARM
+        
+        Returns:
+            (width, height, fps) for video capture devices, None otherwise
+        """
+        fd = os.open(device_path, os.O_RDWR | os.O_NONBLOCK)
+        try:
+            cap = fcntl.ioctl(fd, VIDIOC_QUERYCAP, bytes(V4L2_CAPABILITY_SIZE))
+            capabilities, device_caps = struct.unpack_from('II', cap, 84)
+            if capabilities & V4L2_CAP_DEVICE_CAPS:
+                capabilities = device_caps
+            if not capabilities & V4L2_CAP_VIDEO_CAPTURE:
+                return None
+                
+            request = bytearray(V4L2_FORMAT_SIZE)
+            struct.pack_into('I', request, 0, V4L2_BUF_TYPE_VIDEO_CAPTURE)
+            fmt = fcntl.ioctl(fd, VIDIOC_G_FMT, bytes(request))
+            width, height = struct.unpack_from('II', fmt, V4L2_FORMAT_UNION_OFFSET)
+            
+            fps = 0.0
+            request = bytearray(V4L2_STREAMPARM_SIZE)
+            struct.pack_into('I', request, 0, V4L2_BUF_TYPE_VIDEO_CAPTURE)
+            try:
+                parm = fcntl.ioctl(fd, VIDIOC_G_PARM, bytes(request))
+                numerator, denominator = struct.unpack_from('II', parm, 12)
+                if numerator:
+                    fps = denominator / numerator
+            except OSError:
+                # Frame interval not reported by this driver
+                pass
+                
+            return width, height, fps
+        finally:
+            os.close(fd)
+            
+    def _v4l2_pixel_formats(self, device_path):
+        """
+        Enumerate the capture pixel formats of a V4L2 node with VIDIOC_ENUM_FMT
+        
+        Returns:
+            Set of FOURCC strings (e.g. 'MJPG', 'YUYV'), or None if the node can't be probed
+        """
+        try:
+            fd = os.open(device_path, os.O_RDWR | os.O_NONBLOCK)
+        except OSError:
+            return None
+        formats = set()
+        try:
+            request = bytearray(V4L2_FMTDESC_SIZE)
+            for index in range(64):
+                struct.pack_into('II', request, 0, index, V4L2_BUF_TYPE_VIDEO_CAPTURE)
+                try:
+                    desc = fcntl.ioctl(fd, VIDIOC_ENUM_FMT, bytes(request))
+                except OSError:
+                    # EINVAL past the last format
+                    break
+                formats.add(desc[44:48].decode('ascii', 'replace'))
+        finally:
+            os.close(fd)
+        return formats
+        
     def list_cameras(self):
         """List available camera devices"""
         cameras = []
@@ -96,13 +391,10 @@ class CameraStreamer:
             device_path = f"/dev/video{i}"
             if os.path.exists(device_path):
                 try:
-                    # Try to open the device to check if it's a valid camera
-                    cap = cv2.VideoCapture(i)
-                    if cap.isOpened():
-                        # Get camera info
-                        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-                        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-                        fps = cap.get(cv2.CAP_PROP_FPS)
+                    # Query the device with ioctls rather than opening a capture stream
+                    info = self._query_v4l2_device(device_path)
+                    if info:
+                        width, height, fps = info
                         
                         camera_info = {
                             'device': device_path,
@@ -113,7 +405,6 @@ class CameraStreamer:
                             'type': 'V4L2'
                         }
                         cameras.append(camera_info)
-                        cap.release()
                 except Exception as e:
                     self.logger.debug(f"Failed to query camera {device_path}: {e}")
                     
@@ -144,9 +435,13 @@ class CameraStreamer:
             
         try:
             # Try to open camera
-            if device_path.startswith('/dev/video'):
+            if device_path.startswith('/dev/video') and self._use_v4l2_backend():
+                self._set_low_latency_mode(device_path)
+                self.camera = V4L2Capture(device_path)
+            elif device_path.startswith('/dev/video'):
                 # Extract device index
                 device_index = int(device_path.split('video')[1])
+                self._set_low_latency_mode(device_path)
                 self.camera = cv2.VideoCapture(device_index)
             else:
                 # Try as IP camera or other source
@@ -167,6 +462,27 @@ class CameraStreamer:
             self.logger.error(f"Error connecting to camera {device_path}: {e}")
             return False
             
+    def _use_v4l2_backend(self):
+        """Check whether the direct V4L2 capture backend is requested and available"""
+        if self.camera_config.get('capture_backend', 'opencv') != 'v4l2':
+            return False
+        if V4L2Device is None:
+            self.logger.debug("linuxpy not available, falling back to OpenCV capture")
+            return False
+        return True
+        
+    def _set_low_latency_mode(self, device_path):
+        """Ask the V4L2 driver for its low-latency mode (Rock5B+ ISP), if supported"""
+        try:
+            result = subprocess.run(
+                ['v4l2-ctl', '-d', device_path, '-c', 'low_latency_mode=1'],
+                capture_output=True, text=True, timeout=2
+            )
+            if result.returncode != 0:
+                self.logger.debug(f"low_latency_mode not set on {device_path}: {result.stderr.strip()}")
+        except Exception as e:
+            self.logger.debug(f"v4l2-ctl unavailable: {e}")
+            
     def configure_camera(self):
         """Configure camera parameters"""
         if not self.camera:
@@ -175,6 +491,10 @@ class CameraStreamer:
         try:
             video_config = self.camera_config['video']
             
+            # Request MJPEG from the driver: smaller buffers to dequeue than raw YUYV
+            mjpg = cv2.VideoWriter_fourcc(*'MJPG')
+            self.camera.set(cv2.CAP_PROP_FOURCC, mjpg)
+            
             # Set resolution
             self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, video_config['width'])
             self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, video_config['height'])
@@ -182,9 +502,18 @@ class CameraStreamer:
             # Set FPS
             self.camera.set(cv2.CAP_PROP_FPS, video_config['fps'])
             
-            # Set buffer size to reduce latency
+            # Set buffer size to reduce latency; read() then blocks on the
+            # driver's own frame pacing, so the loops never sleep
             self.camera.set(cv2.CAP_PROP_BUFFERSIZE, 1)
             
+            # Hand back the driver's MJPEG buffer as-is instead of decoding to BGR,
+            # but only if the driver actually took MJPG: raw formats would
+            # otherwise come back as undecodable 1xN buffers
+            if int(self.camera.get(cv2.CAP_PROP_FOURCC)) == mjpg:
+                self.camera.set(cv2.CAP_PROP_CONVERT_RGB, 0)
+            else:
+                self.logger.info("Camera did not accept MJPG, capturing decoded frames")
+            
             # Verify settings
             actual_width = int(self.camera.get(cv2.CAP_PROP_FRAME_WIDTH))
             actual_height = int(self.camera.get(cv2.CAP_PROP_FRAME_HEIGHT))
@@ -194,6 +523,11 @@ class CameraStreamer:
             
             # Update stats
             self.stats['resolution'] = f"{actual_width}x{actual_height}"
+            self._frame_dims = (actual_width, actual_height)
+            
+            # Raw bandwidth depends only on the negotiated format; compute it once
+            self.stats['raw_bandwidth_mbps'] = round(
+                self.calculate_raw_bandwidth(actual_width, actual_height, actual_fps), 3)
             self.stats['target_fps'] = actual_fps
             
             return True
@@ -210,6 +544,20 @@ class CameraStreamer:
             self.stats['camera_connected'] = False
             self.logger.info("Camera disconnected")
             
+    @cached_property
+    def _h264_encoder_args(self):
+        """FFmpeg encoder arguments: Rock5B+ hardware encoder (rkmpp) when available, else libx264"""
+        try:
+            result = subprocess.run(['ffmpeg', '-hide_banner', '-encoders'],
+                                    capture_output=True, text=True, timeout=5)
+            if 'h264_rkmpp' in result.stdout:
+                return ['-c:v', 'h264_rkmpp', '-rc_mode', 'CBR']
+        except Exception as e:
+            self.logger.debug(f"Failed to probe FFmpeg encoders: {e}")
+            
+        self.logger.info("h264_rkmpp not available, using libx264")
+        return ['-c:v', 'libx264', '-preset', 'ultrafast', '-tune', 'zerolatency']
+        
     def start_rtsp_server(self, port=None):
         """Start RTSP server using FFmpeg"""
         if port is None:
@@ -218,17 +566,24 @@ class CameraStreamer:
         rtsp_path = self.camera_config['rtsp']['path']
         video_config = self.camera_config['video']
         
+        # Ask for MJPEG only when the node offers it; forcing it on a
+        # raw-only node (e.g. the rkisp CSI path) makes ffmpeg fail with EINVAL
+        device_path = self.camera_config['default_device']
+        input_format = []
+        if 'MJPG' in (self._v4l2_pixel_formats(device_path) or ()):
+            input_format = ['-input_format', 'mjpeg']
+            
         # FFmpeg command for RTSP server
         cmd = [
             'ffmpeg',
             '-f', 'v4l2',
             '-video_size', f"{video_config['width']}x{video_config['height']}",
             '-framerate', str(video_config['fps']),
-            '-i', self.camera_config['default_device'],
-            '-c:v', 'libx264',
-            '-preset', 'ultrafast',
-            '-tune', 'zerolatency',
+            *input_format,
+            '-i', device_path,
+            *self._h264_encoder_args,
             '-b:v', video_config['bitrate'],
+            '-g', str(video_config['fps']),
             '-f', 'rtsp',
             f'rtsp://0.0.0.0:{port}{rtsp_path}'
         ]
@@ -265,7 +620,8 @@ class CameraStreamer:
             self.rtsp_process = None
             self.logger.info("RTSP server stopped")
             
-    def calculate_raw_bandwidth(self, width, height, fps, bit_depth=8, channels=3):
+    @staticmethod
+    def calculate_raw_bandwidth(width, height, fps, bit_depth=8, channels=3):
         """Calculate raw video bandwidth requirements"""
         bits_per_pixel = bit_depth * channels
         bits_per_frame = width * height * bits_per_pixel
@@ -273,56 +629,109 @@ class CameraStreamer:
         mbps = bits_per_second / (1024 * 1024)  # Convert to Mbps
         return mbps
         
-    def analyze_frame(self, frame):
-        """Analyze frame for quality and statistics"""
+    def _mean_all_channels(self, image):
+        """Mean over all pixels and channels (cv2.mean reports per channel)"""
+        channels = image.shape[2] if image.ndim == 3 else 1
+        return sum(cv2.mean(image)[:channels]) / channels
+        
+    @staticmethod
+    def _is_encoded(frame):
+        """Check whether a frame is a compressed (MJPEG) buffer rather than an image"""
+        return frame.ndim == 1 or frame.shape[0] == 1
+        
+    def _decode(self, frame):
+        """Decode a compressed frame to BGR; images are returned unchanged"""
+        if self._is_encoded(frame):
+            return cv2.imdecode(frame.reshape(-1), cv2.IMREAD_COLOR)
+        return frame
+        
+    def analyze_frame(self, frame, capture_time=None):
+        """
+        Analyze frame for quality and statistics
+        
+        Args:
+            frame: Captured frame
+            capture_time: time.monotonic_ns() when the frame was captured (defaults to now)
+        """
         if frame is None:
             return None
             
-        current_time = time.time()
+        current_time = capture_time if capture_time is not None else time.monotonic_ns()
         frame_size = frame.nbytes
         
         # Store frame timing and size
-        self.frame_times.append(current_time)
-        self.frame_sizes.append(frame_size)
-        
-        # Calculate current FPS
-        if len(self.frame_times) >= 2:
-            time_window = self.frame_times[-1] - self.frame_times[0]
-            if time_window > 0:
-                current_fps = (len(self.frame_times) - 1) / time_window
+        head, filled, recent_sum = _push_frame(
+            self.frame_times, self.frame_sizes, self._frame_head, self._frame_filled,
+            self._recent_size_sum, current_time, frame_size)
+        # Plain ints/floats, so NumPy scalars never leak into the stats dict
+        self._frame_head = int(head)
+        self._frame_filled = filled = int(filled)
+        self._recent_size_sum = int(recent_sum)
+        
+        # Counted here rather than with frame_count: the capture thread
+        # counts frames the ring later drops
+        self._analyzed_count = analyzed = self._analyzed_count + 1
+        
+        # Stats are read about once a second; refresh them every
+        # STATS_EVERY_N_FRAMES frames rather than on every frame
+        self._stats_tick = (self._stats_tick + 1) % STATS_EVERY_N_FRAMES
+        if self._stats_tick == 0:
+            # Calculate current FPS
+            current_fps = float(_window_fps(self.frame_times, head, filled, current_time))
+            if current_fps > 0:
                 self.stats['current_fps'] = round(current_fps, 2)
                 
-        # Calculate bandwidth
-        if len(self.frame_sizes) >= 10:  # Use last 10 frames for bandwidth calculation
-            avg_frame_size = sum(list(self.frame_sizes)[-10:]) / 10
-            if self.stats['current_fps'] > 0:
-                bandwidth_bytes_per_sec = avg_frame_size * self.stats['current_fps']
-                bandwidth_mbps = (bandwidth_bytes_per_sec * 8) / (1024 * 1024)
-                self.stats['bandwidth_mbps'] = round(bandwidth_mbps, 3)
-                
-        # Calculate raw bandwidth
-        height, width = frame.shape[:2]
-        raw_bandwidth = self.calculate_raw_bandwidth(width, height, self.stats['current_fps'])
-        self.stats['raw_bandwidth_mbps'] = round(raw_bandwidth, 3)
-        
+            # Calculate bandwidth
+            if filled >= BANDWIDTH_WINDOW:  # Use last 10 frames for bandwidth calculation
+                avg_frame_size = self._recent_size_sum / BANDWIDTH_WINDOW
+                if self.stats['current_fps'] > 0:
+                    bandwidth_bytes_per_sec = avg_frame_size * self.stats['current_fps']
+                    bandwidth_mbps = (bandwidth_bytes_per_sec * 8) / (1024 * 1024)
+                    self.stats['bandwidth_mbps'] = round(bandwidth_mbps, 3)
+                    
+        # Compressed frames carry no geometry: use the configured resolution,
+        # and skip the pixel analysis unless decoding was asked for
+        if self._is_encoded(frame):
+            width, height = self._frame_dims
+            frame = self._decode(frame) if self._decode_for_analysis else None
+        else:
+            height, width = frame.shape[:2]
+            
         # Frame analysis
         analysis = {
-            'timestamp': current_time,
+            'timestamp': (current_time + self._epoch_offset_ns) * 1e-9,  # Epoch seconds
             'frame_size_bytes': frame_size,
             'resolution': f"{width}x{height}",
-            'channels': len(frame.shape) if len(frame.shape) > 2 else 1,
-            'mean_brightness': np.mean(frame) if len(frame.shape) == 3 else np.mean(frame),
-            'frame_number': self.frame_count
+            'frame_number': analyzed
         }
         
-        # Check for motion (simple method)
-        if hasattr(self, 'previous_frame') and self.previous_frame is not None:
-            diff = cv2.absdiff(frame, self.previous_frame)
-            motion_score = np.mean(diff)
-            analysis['motion_score'] = motion_score
+        if frame is None:
+            return analysis
+            
+        # Mean brightness is a full-frame reduction; refresh it every Nth frame
+        if self._mean_brightness is None or analyzed % self._brightness_every == 0:
+            self._mean_brightness = self._mean_all_channels(frame)
             
-        self.previous_frame = frame.copy()
+        analysis['channels'] = len(frame.shape) if len(frame.shape) > 2 else 1
+        analysis['mean_brightness'] = self._mean_brightness
         
+        # Check for motion on a decimated sample of the frame: the fraction of
+        # sample pixels MOG2 marks as foreground. The model keeps its own
+        # background state, and the sample and mask buffers are reused.
+        step = self._motion_step
+        sample = frame[::step, ::step]
+        buf = self._sample_buf
+        if buf is not None and buf.shape == sample.shape and buf.dtype == sample.dtype:
+            np.copyto(buf, sample)
+            fg = self._bg.apply(buf, self._fg_buf)
+            analysis['motion_score'] = cv2.countNonZero(fg) / fg.size
+        else:
+            # First frame (or new geometry): only seed the background model,
+            # which reports every pixel as foreground on this frame
+            self._sample_buf = np.ascontiguousarray(sample)
+            self._fg_buf = np.empty(sample.shape[:2], dtype=np.uint8)
+            self._bg.apply(self._sample_buf, self._fg_buf)
+            
         return analysis
         
     def start_streaming(self, display=False):
@@ -335,82 +744,181 @@ class CameraStreamer:
             self.logger.warning("Streaming already active")
             return True
             
+        if self._stream_threads_alive():
+            self.logger.error("Previous stream threads still running")
+            return False
+            
         self.streaming = True
         self.start_time = time.time()
+        self._epoch_offset_ns = time.time_ns() - time.monotonic_ns()
         self.frame_count = 0
+        self._analyzed_count = 0
         self.dropped_frames = 0
         
         self.stats['stream_active'] = True
         self.stats['total_frames'] = 0
         self.stats['dropped_frames'] = 0
         
-        # Start monitoring thread
+        self._drain_frame_ring()
+        self._frame_ready.clear()
+        
+        # Start analysis (consumer) and capture (producer) threads
         self.stream_thread = threading.Thread(target=self._streaming_loop, args=(display,))
         self.stream_thread.daemon = True
         self.stream_thread.start()
         
+        self.capture_thread = threading.Thread(target=self._capture_loop)
+        self.capture_thread.daemon = True
+        self.capture_thread.start()
+        
         self.logger.info("Camera streaming started")
         return True
         
     def stop_streaming(self):
         """Stop camera streaming"""
         self.streaming = False
+        self._frame_ready.set()
         
+        if self.capture_thread:
+            self.capture_thread.join(timeout=5)
         if self.stream_thread:
             self.stream_thread.join(timeout=5)
             
+        # Frames never analyzed may still hold driver buffers. Only take
+        # them once both threads are gone, so each frame keeps one owner.
+        if self._stream_threads_alive():
+            self.logger.warning("Streaming threads did not stop; leaving captured frames queued")
+        else:
+            self._drain_frame_ring()
+            
         self.stats['stream_active'] = False
         self.logger.info("Camera streaming stopped")
         
-    def _streaming_loop(self, display=False):
-        """Main streaming loop"""
-        target_frame_time = 1.0 / self.stats['target_fps']
+    def _stream_threads_alive(self):
+        """Check whether the capture or analysis thread of a previous stream is still running"""
+        return any(thread is not None and thread.is_alive()
+                   for thread in (self.capture_thread, self.stream_thread))
         
-        while self.streaming:
+    def _drain_frame_ring(self):
+        """Empty the capture ring, handing any borrowed driver buffers back"""
+        ring = self._frame_ring
+        requeue = getattr(self.camera, 'requeue', None)
+        while True:
             try:
-                loop_start = time.time()
+                frame, _ = ring.popleft()
+            except IndexError:
+                return
+            if requeue:
+                requeue(frame)
                 
+    def _capture_loop(self):
+        """Capture loop: block only on camera reads and hand frames to the analysis thread"""
+        # Bind per-iteration lookups to locals once
+        ring = self._frame_ring
+        ring_append = ring.append
+        ring_pop = ring.popleft
+        ring_size = ring.maxlen
+        mark_ready = self._frame_ready.set
+        cam_read = self.camera.read
+        # Backends lending out driver buffers want them back once a frame is done
+        requeue = getattr(self.camera, 'requeue', None)
+        now = time.monotonic_ns
+        stats = self.stats
+        
+        while self.streaming:
+            try:
                 # Capture frame
-                ret, frame = self.camera.read()
+                ret, frame = cam_read()
+                capture_time = now()
                 
                 if not ret:
                     self.dropped_frames += 1
-                    self.stats['dropped_frames'] = self.dropped_frames
+                    stats['dropped_frames'] = self.dropped_frames
                     self.logger.warning("Failed to capture frame")
                     continue
                     
                 self.frame_count += 1
-                self.stats['total_frames'] = self.frame_count
+                stats['total_frames'] = self.frame_count
                 
-                # Analyze frame
-                frame_analysis = self.analyze_frame(frame)
+                # Analysis fell behind: drop the oldest frame. popleft() rather
+                # than letting append() evict it, so exactly one thread owns it
+                if len(ring) == ring_size:
+                    try:
+                        evicted, _ = ring_pop()
+                    except IndexError:
+                        pass
+                    else:
+                        if requeue:
+                            requeue(evicted)
+                        self.dropped_frames += 1
+                        stats['dropped_frames'] = self.dropped_frames
+                        
+                ring_append((frame, capture_time))
+                mark_ready()
                 
-                # Store bandwidth data
-                if frame_analysis:
-                    bandwidth_data = {
-                        'timestamp': datetime.now(),
-                        'fps': self.stats['current_fps'],
-                        'bandwidth_mbps': self.stats['bandwidth_mbps'],
-                        'raw_bandwidth_mbps': self.stats['raw_bandwidth_mbps'],
-                        'frame_size': frame_analysis['frame_size_bytes']
-                    }
-                    self.bandwidth_history.append(bandwidth_data)
+            except Exception as e:
+                self.logger.error(f"Error in capture loop: {e}")
+                break
+                
+        self.streaming = False
+        mark_ready()
+        
+    def _streaming_loop(self, display=False):
+        """Main streaming loop: analyze (and optionally display) captured frames"""
+        # Bind per-iteration lookups to locals once
+        ring_pop = self._frame_ring.popleft
+        ready = self._frame_ready
+        analyze = self.analyze_frame
+        requeue = getattr(self.camera, 'requeue', None)
+        history = self.bandwidth_history
+        stats = self.stats
+        
+        while self.streaming:
+            try:
+                try:
+                    frame, capture_time = ring_pop()
+                except IndexError:
+                    ready.wait(timeout=0.5)
+                    ready.clear()
+                    continue
                     
-                # Display frame if requested
-                if display:
-                    cv2.imshow('Camera Stream', frame)
-                    if cv2.waitKey(1) & 0xFF == ord('q'):
-                        break
-                        
-                # Frame rate control
-                loop_time = time.time() - loop_start
-                if loop_time < target_frame_time:
-                    time.sleep(target_frame_time - loop_time)
+                try:
+                    # Analyze frame
+                    frame_analysis = analyze(frame, capture_time)
                     
+                    # Store bandwidth data
+                    if frame_analysis:
+                        head = self._bw_head
+                        history[head] = (
+                            frame_analysis['timestamp'],
+                            stats['current_fps'],
+                            stats['bandwidth_mbps'],
+                            stats['raw_bandwidth_mbps'],
+                            frame_analysis['frame_size_bytes']
+                        )
+                        self._bw_head = (head + 1) % BANDWIDTH_HISTORY_SIZE
+                        self._bw_count = min(self._bw_count + 1, BANDWIDTH_HISTORY_SIZE)
+                        
+                    # Display frame if requested
+                    if display:
+                        image = self._decode(frame)
+                        if image is not None:
+                            cv2.imshow('Camera Stream', image)
+                finally:
+                    # Give the driver buffer back even if analysis raised
+                    if requeue:
+                        requeue(frame)
+                        
+                if display and cv2.waitKey(1) & 0xFF == ord('q'):
+                    break
+                        
             except Exception as e:
                 self.logger.error(f"Error in streaming loop: {e}")
                 break
                 
+        # Stop the capture thread too if analysis ended on its own
+        self.streaming = False
+        
         if display:
             cv2.destroyAllWindows()
             
@@ -440,22 +948,50 @@ class CameraStreamer:
             'rtsp_active': self.rtsp_process is not None and self.rtsp_process.poll() is None
         }
         
-    def get_bandwidth_history(self, duration_minutes=60):
-        """Get bandwidth history for specified duration"""
-        cutoff_time = datetime.now() - timedelta(minutes=duration_minutes)
-        history = []
-        
-        for entry in self.bandwidth_history:
-            if entry['timestamp'] > cutoff_time:
-                history.append({
-                    'timestamp': entry['timestamp'].isoformat(),
-                    'fps': entry['fps'],
-                    'bandwidth_mbps': entry['bandwidth_mbps'],
-                    'raw_bandwidth_mbps': entry['raw_bandwidth_mbps'],
-                    'frame_size': entry['frame_size']
-                })
-                
-        return history
+    def _bandwidth_rows_since(self, cutoff_time):
+        """
+        Return bandwidth history rows newer than cutoff_time as a structured array, oldest first
+        
+        The ring holds at most two chronologically sorted runs (before and after
+        the write head), so the cutoff is found by binary search in each.
+        """
+        ring = self.bandwidth_history
+        if self._bw_count < BANDWIDTH_HISTORY_SIZE:
+            runs = (ring[:self._bw_count],)
+        else:
+            runs = (ring[self._bw_head:], ring[:self._bw_head])
+            
+        return np.concatenate([run[np.searchsorted(run['timestamp'], cutoff_time, side='right'):] for run in runs])
+        
+    def _bandwidth_history_since(self, cutoff_time):
+        """Return bandwidth history rows newer than cutoff_time as tuples, oldest first"""
+        return self._bandwidth_rows_since(cutoff_time).tolist()
+        
+    def get_bandwidth_history(self, duration_minutes=60, buckets=None):
+        """
+        Get bandwidth history for specified duration
+        
+        Args:
+            duration_minutes: How far back to go
+            buckets: If set, reduce the samples to at most this many
+                min/max/avg buckets (see perf_kernels.downsample_rows)
+        """
+        cutoff_time = time.time() - duration_minutes * 60
+        if buckets:
+            rows = self._bandwidth_rows_since(cutoff_time)
+            return downsample_rows(rows, BANDWIDTH_HISTORY_DTYPE.names[1:], buckets, rows['timestamp'])
+            
+        return [
+            {
+                'timestamp': datetime.fromtimestamp(timestamp).isoformat(),
+                'fps': fps,
+                'bandwidth_mbps': bandwidth_mbps,
+                'raw_bandwidth_mbps': raw_bandwidth_mbps,
+                'frame_size': frame_size
+            }
+            for timestamp, fps, bandwidth_mbps, raw_bandwidth_mbps, frame_size
+            in self._bandwidth_history_since(cutoff_time)
+        ]
         
     def test_camera_performance(self, duration=30):
         """Test camera performance for specified duration"""
@@ -482,15 +1018,20 @@ class CameraStreamer:
         
         # Calculate summary statistics
         if performance_data:
-            fps_values = [data['current_fps'] for data in performance_data if data['current_fps'] > 0]
-            bandwidth_values = [data['bandwidth_mbps'] for data in performance_data if data['bandwidth_mbps'] > 0]
+            count = len(performance_data)
+            fps = np.fromiter((data['current_fps'] for data in performance_data), dtype=np.float64, count=count)
+            bandwidth = np.fromiter((data['bandwidth_mbps'] for data in performance_data), dtype=np.float64, count=count)
+            
+            # Samples taken before the first measurement read 0; leave them out
+            fps = fps[fps > 0]
+            bandwidth = bandwidth[bandwidth > 0]
             
             summary = {
                 'test_duration': duration,
-                'avg_fps': sum(fps_values) / len(fps_values) if fps_values else 0,
-                'min_fps': min(fps_values) if fps_values else 0,
-                'max_fps': max(fps_values) if fps_values else 0,
-                'avg_bandwidth_mbps': sum(bandwidth_values) / len(bandwidth_values) if bandwidth_values else 0,
+                'avg_fps': float(fps.mean()) if fps.size else 0,
+                'min_fps': float(fps.min()) if fps.size else 0,
+                'max_fps': float(fps.max()) if fps.size else 0,
+                'avg_bandwidth_mbps': float(bandwidth.mean()) if bandwidth.size else 0,
                 'total_frames': performance_data[-1]['total_frames'],
                 'dropped_frames': performance_data[-1]['dropped_frames'],
                 'drop_rate_percent': performance_data[-1]['drop_rate_percent'],
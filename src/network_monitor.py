@@ -11,20 +11,239 @@ import json
 import argparse
 import logging
 import threading
-from datetime import datetime, timedelta
-from collections import deque, defaultdict
+import copy
+import pickle
+import hashlib
+import stat
+import tempfile
+import mmap
+import struct
+import select
+import ctypes
+from datetime import datetime
+from collections import defaultdict
 import yaml
+import numpy as np
 import psutil
 import netifaces
 import subprocess
 import socket
 import re
 from pathlib import Path
+from typing import NamedTuple
+from functools import lru_cache
+from perf_kernels import downsample_rows
+
+try:
+    from numba import njit
+except ImportError:
+    # Without Numba the rate kernel below runs as plain Python
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Auto-detect config path
 SCRIPT_DIR = Path(__file__).parent
 CONFIG_PATH = SCRIPT_DIR.parent / "config" / "settings.yaml"
 
+# Parsed configs keyed by absolute path, as (st_mtime_ns, config) so a hot
+# reload replaces the entry, and the per-user directory holding pickled
+# copies for the next process (kept out of the config directory)
+_config_cache = {}
+CONFIG_CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'),
+                                'radxa', 'config')
+
+class InterfaceCounters(NamedTuple):
+    """One sample of an interface's I/O counters, as get_network_statistics returns them"""
+    bytes_sent: int
+    bytes_recv: int
+    packets_sent: int
+    packets_recv: int
+    errin: int
+    errout: int
+    dropin: int
+    dropout: int
+    
+    
+# Kernel per-interface I/O counters, the counters kept per interface, and
+# the /proc/net/dev column of each (receive columns 0-7, transmit 8-15)
+PROC_NET_DEV = "/proc/net/dev"
+COUNTER_FIELDS = InterfaceCounters._fields
+PROC_NET_DEV_COLUMNS = (8, 0, 9, 1, 2, 10, 3, 11)
+
+# Rates derived from the first four counters, then the two byte counters in Mbps
+RATE_FIELDS = ('bytes_sent_per_sec', 'bytes_recv_per_sec',
+               'packets_sent_per_sec', 'packets_recv_per_sec')
+MBPS_FIELDS = ('mbps_sent', 'mbps_recv')
+_N_RATES = len(RATE_FIELDS)
+_MEGA = 1024 * 1024
+
+# Main routing table and the rtnetlink constants needed to print routes as `ip route` does
+RT_TABLE_MAIN = 254
+RTN_UNICAST = 1
+RT_PROTO_NAMES = {2: 'kernel', 4: 'static', 16: 'dhcp'}  # 'boot' is implied, as in ip
+RT_SCOPE_NAMES = {253: 'link', 254: 'host'}
+
+# Interface name prefixes per type, checked in order by _interface_type
+INTERFACE_TYPE_PREFIXES = (
+    ('ethernet', ('eth',)),
+    ('wireless', ('wlan', 'wifi')),
+    ('usb', ('usb',)),
+    ('ppp', ('ppp',)),
+)
+
+# Start of a lease block in an ISC-style leases file: "lease <ip> {"
+DHCP_LEASE_RE = re.compile(rb'^[ \t]*lease\s+(\S+)\s*\{', re.M)
+
+# Nanoseconds get_network_interfaces reuses its last result while the set of
+# interface names is unchanged (link state and addresses may lag this much)
+INTERFACE_CACHE_TTL_NS = 5_000_000_000
+
+# inotify(7) flags for watching the config directory: a save either
+# rewrites the file in place or renames a new copy over it
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+INOTIFY_EVENT = struct.Struct('iIII')  # wd, mask, cookie, name length
+CONFIG_WATCH_POLL_MS = 1000  # How often the watcher checks for stop
+
+# Seconds a resolved PID -> process name map is reused across connection queries
+PROCESS_NAME_TTL = 5.0
+
+# Per-interface history rings: 1 hour at 1s intervals
+HISTORY_SIZE = 3600
+# Timestamps are time.monotonic_ns() values
+NETWORK_HISTORY_DTYPE = np.dtype([('timestamp', 'i8')] + [(field, 'i8') for field in COUNTER_FIELDS])
+BANDWIDTH_HISTORY_DTYPE = np.dtype([('timestamp', 'i8')] + [(field, 'f8') for field in RATE_FIELDS + MBPS_FIELDS])
+
+
+@njit(cache=True, fastmath=True)
+def _compute_rates(current, previous, time_delta, out):
+    """
+    Per-second rates between two counter samples, one row per interface
+    
+    Args:
+        current, previous: int64 counter rows whose first _N_RATES columns
+            follow RATE_FIELDS
+        time_delta: Seconds between the samples
+        out: float64 array receiving RATE_FIELDS columns, then MBPS_FIELDS
+    """
+    inv_dt = 1.0 / time_delta
+    mbps_scale = 8.0 * inv_dt / _MEGA
+    for i in range(current.shape[0]):
+        for j in range(_N_RATES):
+            out[i, j] = (current[i, j] - previous[i, j]) * inv_dt
+        # Bytes sent/received in Mbps
+        out[i, _N_RATES] = (current[i, 0] - previous[i, 0]) * mbps_scale
+        out[i, _N_RATES + 1] = (current[i, 1] - previous[i, 1]) * mbps_scale
+        
+        
+def _interface_type(interface):
+    """Interface type from its name"""
+    for interface_type, prefixes in INTERFACE_TYPE_PREFIXES:
+        if interface.startswith(prefixes):
+            return interface_type
+    return 'unknown'
+    
+    
+@lru_cache(maxsize=64)
+def _iface_static(interface):
+    """
+    Per-interface metadata that only changes when the interface is replaced
+    
+    Memoized by name; NetworkMonitor.invalidate_interface_cache clears it,
+    which the dashboard's rtnetlink watcher calls on link changes (e.g. a
+    USB adapter re-plugged under the same name).
+    
+    Returns:
+        Tuple (type, kernel driver name or None for virtual interfaces)
+    """
+    try:
+        driver = os.path.basename(os.readlink(f"/sys/class/net/{interface}/device/driver"))
+    except OSError:
+        driver = None
+    return _interface_type(interface), driver
+    
+    
+def _dumps_json(obj):
+    """
+    Serialize obj to indented JSON bytes
+    
+    Uses orjson when installed (datetimes and NumPy values natively),
+    otherwise the standard library; datetimes are ISO 8601 either way and
+    anything else falls back to str().
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY, default=str)
+    return json.dumps(obj, indent=2, default=lambda o: o.isoformat() if isinstance(o, datetime) else str(o)).encode()
+    
+    
+class HistoryRing:
+    """
+    Fixed-size ring of structured NumPy rows, oldest overwritten first
+    
+    Single producer, any number of readers, no lock: the writer stores a row
+    and only then publishes it by bumping `written`, and readers copy a
+    snapshot and discard any rows the writer may have reused meanwhile, so
+    a reader never blocks the sampler. Timestamps (time.monotonic_ns(),
+    first field) are appended in order.
+    """
+    
+    def __init__(self, dtype, size=HISTORY_SIZE):
+        self.rows = np.zeros(size, dtype=dtype)
+        self.written = 0  # Rows ever written; the next goes to written % size
+        
+    def __len__(self):
+        return min(self.written, len(self.rows))
+        
+    def append(self, row):
+        """Write one row (a tuple in dtype field order)"""
+        written = self.written
+        self.rows[written % len(self.rows)] = row
+        self.written = written + 1
+        
+    def snapshot(self):
+        """Copy of the valid rows, oldest first"""
+        size = len(self.rows)
+        written = self.written
+        if written <= size:
+            rows = self.rows[:written].copy()
+        else:
+            head = written % size
+            rows = np.concatenate((self.rows[head:], self.rows[:head]))
+            
+        # Rows the writer reached while we copied (plus the one it may be
+        # writing now) no longer hold the samples we expected
+        reused = max(0, self.written + 1 - size) - max(0, written - size)
+        return rows[reused:] if reused > 0 else rows
+        
+    def window(self, cutoff=None):
+        """Structured array of the rows newer than cutoff (monotonic ns; all rows if None), oldest first"""
+        rows = self.snapshot()
+        if cutoff is not None:
+            rows = rows[np.searchsorted(rows['timestamp'], cutoff, side='right'):]
+        return rows
+        
+    def since(self, cutoff=None):
+        """
+        Rows newer than cutoff (monotonic ns; all rows if None), oldest first
+        
+        Returns:
+            List of row tuples
+        """
+        return self.window(cutoff).tolist()
+        
+        
 class NetworkMonitor:
     """
     Real-time network monitoring and management system for Radxa Rock5B+
@@ -35,32 +254,140 @@ class NetworkMonitor:
         Initialize Network Monitor
         
         Args:
-            config_path: Path to configuration file (auto-detected if None)
+            config_path: Path to configuration file (auto-detected if None),
+                or an already-parsed config dict (not watched for changes)
         """
-        if config_path is None:
-            config_path = str(CONFIG_PATH)
-        self.config = self.load_config(config_path)
+        if isinstance(config_path, dict):
+            # Parsed once by the caller; copy so changes here stay local
+            self.config_path = None
+            self.config = copy.deepcopy(config_path)
+        else:
+            if config_path is None:
+                config_path = str(CONFIG_PATH)
+            self.config_path = os.path.abspath(config_path)
+            self.config = self.load_config(config_path)
         self.logger = self.setup_logging()
-        self.interfaces = self.config['monitoring']['interfaces']
+        self.interfaces = self.config['monitoring']['interfaces']  # Also sets _iface_set
         self.update_interval = self.config['monitoring']['network_update_interval']
         self.data_retention = self.config['monitoring']['data_retention']
         
         # Data storage
-        self.network_history = defaultdict(lambda: deque(maxlen=3600))  # 1 hour at 1s intervals
-        self.bandwidth_history = defaultdict(lambda: deque(maxlen=3600))
+        self.network_history = defaultdict(lambda: HistoryRing(NETWORK_HISTORY_DTYPE))
+        self.bandwidth_history = defaultdict(lambda: HistoryRing(BANDWIDTH_HISTORY_DTYPE))
         self.system_info = {}
+        self._proc_fds = {}  # /proc path -> descriptor reused by _read_proc_file
+        self._ipr = None  # pyroute2 IPRoute socket, opened on first routing table query
+        self._iface_cache = None  # (monotonic ns, interface names, info list) from get_network_interfaces
+        self._process_names = {}  # PID -> name, cleared every PROCESS_NAME_TTL seconds
+        self._process_names_expiry = 0.0
         self.running = False
         self.monitor_thread = None
+        self._sysinfo_thread = None
+        self._stop_event = threading.Event()  # Wakes both loops on stop
+        self._watch_thread = None
+        self._pending_config = None  # Reloaded config for the monitoring loop to apply
+        
+        # Prime the CPU counters so get_system_info can read them without blocking
+        psutil.cpu_percent(interval=None)
+        psutil.cpu_percent(interval=None, percpu=True)
+        
+    @property
+    def interfaces(self):
+        """Interfaces to monitor"""
+        return self._interfaces
+        
+    @interfaces.setter
+    def interfaces(self, interfaces):
+        self._interfaces = list(interfaces)
+        self._iface_set = frozenset(self._interfaces)
+        self._iface_index = {name: i for i, name in enumerate(self._interfaces)}
+        
+        # Counters as SoA int64 rows: one per monitored interface, then the
+        # overall totals. Two slots ping-pong between current and previous
+        # sample in the monitoring loop.
+        count = len(self._interfaces)
+        self._counters = np.zeros((2, count + 1, len(COUNTER_FIELDS)), dtype=np.int64)
+        self._present = np.zeros((2, count), dtype=bool)
+        self._rates_buf = np.zeros((count, _N_RATES + len(MBPS_FIELDS)))
+        self._slot = 0
+        self._last_sample_ns = None  # monotonic ns of the sample in slot _slot ^ 1
         
     def load_config(self, config_path):
         """Load configuration from YAML file"""
         try:
-            with open(config_path, 'r') as file:
-                return yaml.safe_load(file)
+            return self._read_config(config_path)
         except Exception as e:
             print(f"Error loading config: {e}")
             sys.exit(1)
             
+    def _read_config(self, config_path):
+        """Parse the config (through the in-process and pickle caches); raises on error"""
+        config_path = os.path.abspath(config_path)
+        st = os.stat(config_path)
+        cached = _config_cache.get(config_path)
+        if cached is not None and cached[0] == st.st_mtime_ns:
+            config = cached[1]
+        else:
+            config = self._load_config_file(config_path, (st.st_mtime_ns, st.st_size))
+            _config_cache[config_path] = (st.st_mtime_ns, config)
+        # Copy so instances never share (and mutate) the cached dict
+        return copy.deepcopy(config)
+            
+    def _load_config_file(self, config_path, file_key):
+        """
+        Load a YAML file through a pickled copy in CONFIG_CACHE_DIR
+        
+        The pickle stores (file_key, config) and is used only while file_key,
+        the file's (st_mtime_ns, st_size), still matches; otherwise the YAML is
+        parsed and the pickle rewritten atomically when the cache allows it.
+        Unpickling runs code, so only a regular file owned by this user in a
+        directory and file nobody else can write is ever loaded.
+        """
+        name = hashlib.sha1(config_path.encode()).hexdigest()[:16] + '.pkl'
+        cache_path = os.path.join(CONFIG_CACHE_DIR, name)
+        try:
+            fd = os.open(cache_path, os.O_RDONLY | os.O_NOFOLLOW)
+            with open(fd, 'rb') as f:
+                if self._trusted_cache_file(os.fstat(fd)) and \
+                        self._trusted_cache_file(os.stat(CONFIG_CACHE_DIR)):
+                    cached_key, config = pickle.load(f)
+                    if cached_key == file_key:
+                        return config
+        except Exception:
+            # Missing, untrusted, stale format or corrupt: reparse below
+            pass
+            
+        with open(config_path, 'r') as file:
+            config = yaml.load(file, Loader=YamlLoader)
+            
+        try:
+            os.makedirs(CONFIG_CACHE_DIR, mode=0o700, exist_ok=True)
+            if not self._trusted_cache_file(os.stat(CONFIG_CACHE_DIR)):
+                return config
+            # mkstemp opens with O_EXCL under a fresh 0o600 name
+            fd, tmp_path = tempfile.mkstemp(prefix=f".{name}.", suffix='.tmp', dir=CONFIG_CACHE_DIR)
+        except OSError:
+            # No writable cache directory: keep parsing each start
+            return config
+        try:
+            with open(fd, 'wb') as f:
+                pickle.dump((file_key, config), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+                
+        return config
+        
+    @staticmethod
+    def _trusted_cache_file(st):
+        """Check that a config cache file or directory is ours and not group/other-writable"""
+        return (st.st_uid == os.geteuid()
+                and (stat.S_ISREG(st.st_mode) or stat.S_ISDIR(st.st_mode))
+                and not st.st_mode & (stat.S_IWGRP | stat.S_IWOTH))
+        
     def setup_logging(self):
         """Setup logging configuration"""
         logging.basicConfig(
@@ -71,20 +398,45 @@ class NetworkMonitor:
         
     def get_network_interfaces(self):
         """Get all available network interfaces"""
+        now = time.monotonic_ns()
+        names = tuple(netifaces.interfaces())
+        cache = self._iface_cache
+        # Reuse the last scan unless it's stale or an interface came or went
+        if cache is not None and now - cache[0] < INTERFACE_CACHE_TTL_NS and cache[1] == names:
+            return list(cache[2])
+            
+        # One psutil scan covers every interface
+        stats = psutil.net_if_stats()
+        addrs = psutil.net_if_addrs()
         interfaces = []
-        for interface in netifaces.interfaces():
+        for interface in names:
             if interface != 'lo':  # Skip loopback
-                info = self.get_interface_info(interface)
+                info = self.get_interface_info(interface, stats, addrs)
                 if info:
                     interfaces.append(info)
-        return interfaces
+        self._iface_cache = (now, names, interfaces)
+        return list(interfaces)
+        
+    def invalidate_interface_cache(self):
+        """Make the next get_network_interfaces call rescan, e.g. after a link change"""
+        self._iface_cache = None
+        _iface_static.cache_clear()
         
-    def get_interface_info(self, interface):
-        """Get detailed information about a network interface"""
+    def get_interface_info(self, interface, stats=None, addrs=None):
+        """
+        Get detailed information about a network interface
+        
+        Args:
+            interface: Interface name
+            stats: psutil.net_if_stats() result to reuse (read if None)
+            addrs: psutil.net_if_addrs() result to reuse (read if None)
+        """
         try:
             # Get interface statistics
-            stats = psutil.net_if_stats()
-            addrs = psutil.net_if_addrs()
+            if stats is None:
+                stats = psutil.net_if_stats()
+            if addrs is None:
+                addrs = psutil.net_if_addrs()
             
             if interface not in stats:
                 return None
@@ -105,12 +457,13 @@ class NetworkMonitor:
                 elif addr.family == psutil.AF_LINK:
                     mac_addr = addr.address
                     
-            # Get interface type
-            interface_type = self.get_interface_type(interface)
+            # Interface type and driver don't change while it exists
+            interface_type, driver = _iface_static(interface)
             
             return {
                 'name': interface,
                 'type': interface_type,
+                'driver': driver,
                 'is_up': interface_stats.isup,
                 'speed': interface_stats.speed,
                 'mtu': interface_stats.mtu,
@@ -126,111 +479,162 @@ class NetworkMonitor:
             
     def get_interface_type(self, interface):
         """Determine the type of network interface"""
-        if interface.startswith('eth'):
-            return 'ethernet'
-        elif interface.startswith('wlan') or interface.startswith('wifi'):
-            return 'wireless'
-        elif interface.startswith('usb'):
-            return 'usb'
-        elif interface.startswith('ppp'):
-            return 'ppp'
-        else:
-            return 'unknown'
+        return _iface_static(interface)[0]
             
     def get_network_statistics(self):
-        """Get current network I/O statistics"""
+        """
+        Get current network I/O statistics
+        
+        While monitoring runs, the sampler's latest reading is reused instead
+        of reading /proc/net/dev again; otherwise the counters are read now.
+        """
         try:
-            # Get overall network stats
-            net_io = psutil.net_io_counters()
-            net_io_pernic = psutil.net_io_counters(pernic=True)
-            
-            current_time = datetime.now()
+            sample = self._latest_sample()
+            if sample is None:
+                # Sample into scratch arrays: the ping-pong slots belong to the monitoring loop
+                counters = np.empty_like(self._counters[0])
+                present = np.empty_like(self._present[0])
+                self._read_proc_net_dev(counters, present)
+                current_time = datetime.now()
+            else:
+                counters, present, sample_ns = sample
+                current_time = datetime.fromtimestamp((sample_ns + time.time_ns() - time.monotonic_ns()) * 1e-9)
+            overall, interfaces = self._counter_tuples(counters, present)
             
-            stats = {
+            return {
                 'timestamp': current_time.isoformat(),
-                'overall': {
-                    'bytes_sent': net_io.bytes_sent,
-                    'bytes_recv': net_io.bytes_recv,
-                    'packets_sent': net_io.packets_sent,
-                    'packets_recv': net_io.packets_recv,
-                    'errin': net_io.errin,
-                    'errout': net_io.errout,
-                    'dropin': net_io.dropin,
-                    'dropout': net_io.dropout
-                },
-                'interfaces': {}
+                'overall': overall,
+                'interfaces': interfaces
             }
             
-            # Get per-interface stats
-            for interface in self.interfaces:
-                if interface in net_io_pernic:
-                    iface_stats = net_io_pernic[interface]
-                    stats['interfaces'][interface] = {
-                        'bytes_sent': iface_stats.bytes_sent,
-                        'bytes_recv': iface_stats.bytes_recv,
-                        'packets_sent': iface_stats.packets_sent,
-                        'packets_recv': iface_stats.packets_recv,
-                        'errin': iface_stats.errin,
-                        'errout': iface_stats.errout,
-                        'dropin': iface_stats.dropin,
-                        'dropout': iface_stats.dropout
-                    }
-                    
-            return stats
-            
         except Exception as e:
             self.logger.error(f"Error getting network statistics: {e}")
             return None
             
+    def _latest_sample(self):
+        """
+        Copy of the monitoring loop's last completed sample, if it is fresh
+        
+        Returns:
+            Tuple (counters, present, monotonic ns) or None when not monitoring
+            or the sample is older than two update intervals
+        """
+        sample_ns = self._last_sample_ns
+        if not self.running or sample_ns is None:
+            return None
+        if time.monotonic_ns() - sample_ns > 2 * self.update_interval * 1e9:
+            return None
+            
+        # The loop has flipped _slot past the sample it finished and now
+        # writes the other slot; if it flips again mid-copy, read afresh
+        slot = self._slot ^ 1
+        counters = self._counters[slot].copy()
+        present = self._present[slot].copy()
+        if self._slot ^ 1 != slot or self._last_sample_ns != sample_ns:
+            return None
+        return counters, present, sample_ns
+        
+    def _read_proc_file(self, path):
+        """
+        Read a /proc file through a descriptor kept open across ticks
+        
+        procfs regenerates the contents on every read from offset 0, so each
+        sample costs one pread() instead of an open/fstat/read/close chain.
+        """
+        fd = self._proc_fds.get(path)
+        if fd is None:
+            fd = self._proc_fds[path] = os.open(path, os.O_RDONLY)
+        chunks = []
+        offset = 0
+        while True:
+            chunk = os.pread(fd, 65536, offset)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            offset += len(chunk)
+        return b''.join(chunks).decode()
+        
+    def _read_proc_net_dev(self, counters, present):
+        """
+        Read I/O counters from /proc/net/dev in one pass
+        
+        Args:
+            counters: int64 array (interfaces + 1, COUNTER_FIELDS) to fill; the
+                last row gets the totals over every interface, as
+                psutil.net_io_counters() reports them
+            present: bool array marking which monitored interfaces were found
+        """
+        index = self._iface_index
+        columns = PROC_NET_DEV_COLUMNS
+        rows = []
+        present[:] = False
+        
+        # Skip the two header lines
+        for line in self._read_proc_file(PROC_NET_DEV).splitlines()[2:]:
+            name, _, rest = line.partition(':')
+            fields = rest.split()
+            row = [int(fields[column]) for column in columns]
+            rows.append(row)
+            
+            i = index.get(name.strip())
+            if i is not None:
+                counters[i] = row
+                present[i] = True
+                
+        counters[-1] = np.sum(rows, axis=0, dtype=np.int64) if rows else 0
+        
+    def _counter_tuples(self, counters, present):
+        """Build the (overall, per-interface) InterfaceCounters for one sample"""
+        make = InterfaceCounters._make
+        overall = make(counters[-1].tolist())
+        interfaces = {name: make(counters[i].tolist()) for name, i in self._iface_index.items() if present[i]}
+        return overall, interfaces
+        
+    @staticmethod
+    def _statistics_json(stats):
+        """Expand get_network_statistics() counters into dicts for JSON output"""
+        if not stats:
+            return stats
+        return {
+            'timestamp': stats['timestamp'],
+            'overall': stats['overall']._asdict(),
+            'interfaces': {name: counters._asdict() for name, counters in stats['interfaces'].items()}
+        }
+        
     def calculate_bandwidth(self, current_stats, previous_stats, time_delta):
         """Calculate bandwidth from two statistics snapshots"""
         if not previous_stats or time_delta <= 0:
             return None
             
-        bandwidth = {
-            'timestamp': current_stats['timestamp'],
-            'overall': {},
-            'interfaces': {}
-        }
+        # Overall first, then every interface present in both snapshots
+        current_interfaces = current_stats['interfaces']
+        previous_interfaces = previous_stats['interfaces']
+        monitored = self._iface_set
+        names = [name for name in current_interfaces if name in monitored and name in previous_interfaces]
+        current = [current_stats['overall']] + [current_interfaces[name] for name in names]
+        previous = [previous_stats['overall']] + [previous_interfaces[name] for name in names]
         
-        # Calculate overall bandwidth
-        current_overall = current_stats['overall']
-        previous_overall = previous_stats['overall']
+        rates = np.empty((len(current), _N_RATES + len(MBPS_FIELDS)))
+        _compute_rates(np.array([c[:_N_RATES] for c in current], dtype=np.int64),
+                       np.array([p[:_N_RATES] for p in previous], dtype=np.int64),
+                       float(time_delta), rates)
+        rates = rates.tolist()
         
-        bandwidth['overall'] = {
-            'bytes_sent_per_sec': (current_overall['bytes_sent'] - previous_overall['bytes_sent']) / time_delta,
-            'bytes_recv_per_sec': (current_overall['bytes_recv'] - previous_overall['bytes_recv']) / time_delta,
-            'packets_sent_per_sec': (current_overall['packets_sent'] - previous_overall['packets_sent']) / time_delta,
-            'packets_recv_per_sec': (current_overall['packets_recv'] - previous_overall['packets_recv']) / time_delta
+        return {
+            'timestamp': current_stats['timestamp'],
+            'overall': dict(zip(RATE_FIELDS, rates[0])),
+            'interfaces': {name: dict(zip(RATE_FIELDS + MBPS_FIELDS, row)) for name, row in zip(names, rates[1:])}
         }
         
-        # Calculate per-interface bandwidth
-        for interface in self.interfaces:
-            if (interface in current_stats['interfaces'] and 
-                interface in previous_stats['interfaces']):
-                
-                current_iface = current_stats['interfaces'][interface]
-                previous_iface = previous_stats['interfaces'][interface]
-                
-                bandwidth['interfaces'][interface] = {
-                    'bytes_sent_per_sec': (current_iface['bytes_sent'] - previous_iface['bytes_sent']) / time_delta,
-                    'bytes_recv_per_sec': (current_iface['bytes_recv'] - previous_iface['bytes_recv']) / time_delta,
-                    'packets_sent_per_sec': (current_iface['packets_sent'] - previous_iface['packets_sent']) / time_delta,
-                    'packets_recv_per_sec': (current_iface['packets_recv'] - previous_iface['packets_recv']) / time_delta,
-                    'mbps_sent': ((current_iface['bytes_sent'] - previous_iface['bytes_sent']) * 8) / (time_delta * 1024 * 1024),
-                    'mbps_recv': ((current_iface['bytes_recv'] - previous_iface['bytes_recv']) * 8) / (time_delta * 1024 * 1024)
-                }
-                
-        return bandwidth
-        
     def get_system_info(self):
         """Get system information"""
         try:
             # CPU information
             cpu_info = {
                 'count': psutil.cpu_count(),
-                'usage_percent': psutil.cpu_percent(interval=1),
-                'per_cpu': psutil.cpu_percent(interval=1, percpu=True),
+                # Non-blocking: measured since the previous call (primed in __init__)
+                'usage_percent': psutil.cpu_percent(interval=None),
+                'per_cpu': psutil.cpu_percent(interval=None, percpu=True),
                 'freq': psutil.cpu_freq()._asdict() if psutil.cpu_freq() else None
             }
             
@@ -277,11 +681,39 @@ class NetworkMonitor:
             self.logger.error(f"Error getting system info: {e}")
             return None
             
+    def _resolve_process_names(self, pids):
+        """
+        Map PIDs to process names, looking each PID up at most once per TTL
+        
+        Args:
+            pids: Set of PIDs to resolve
+            
+        Returns:
+            Dict PID -> process name ('unknown' if it can't be read)
+        """
+        now = time.monotonic()
+        if now >= self._process_names_expiry:
+            # PIDs get reused, so forget old names instead of keeping them forever
+            self._process_names = {}
+            self._process_names_expiry = now + PROCESS_NAME_TTL
+            
+        names = self._process_names
+        for pid in pids - names.keys():
+            try:
+                names[pid] = psutil.Process(pid).name()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                names[pid] = 'unknown'
+        return names
+        
     def get_network_connections(self):
         """Get active network connections"""
         try:
+            conns = psutil.net_connections(kind='inet')
+            # One lookup per process rather than per socket
+            names = self._resolve_process_names({conn.pid for conn in conns if conn.pid})
+            
             connections = []
-            for conn in psutil.net_connections(kind='inet'):
+            for conn in conns:
                 connection_info = {
                     'fd': conn.fd,
                     'family': conn.family.name if conn.family else 'unknown',
@@ -292,14 +724,9 @@ class NetworkMonitor:
                     'pid': conn.pid
                 }
                 
-                # Get process name if PID is available
                 if conn.pid:
-                    try:
-                        process = psutil.Process(conn.pid)
-                        connection_info['process_name'] = process.name()
-                    except (psutil.NoSuchProcess, psutil.AccessDenied):
-                        connection_info['process_name'] = 'unknown'
-                        
+                    connection_info['process_name'] = names[conn.pid]
+                    
                 connections.append(connection_info)
                 
             return connections
@@ -320,14 +747,14 @@ class NetworkMonitor:
         for lease_file in lease_files:
             if os.path.exists(lease_file):
                 try:
-                    with open(lease_file, 'r') as f:
-                        content = f.read()
-                        # Parse DHCP lease file
-                        # This is a simplified parser
-                        for line in content.split('\n'):
-                            if 'lease' in line and '{' in line:
-                                ip = line.split()[1]
-                                leases.append({'ip': ip, 'file': lease_file})
+                    with open(lease_file, 'rb') as f:
+                        # mmap can't map an empty file
+                        if os.fstat(f.fileno()).st_size == 0:
+                            continue
+                        # Scan the mapped file in place rather than splitting it into lines
+                        with mmap.mmap(f.fileno(), 0, prot=mmap.PROT_READ) as mm:
+                            for match in DHCP_LEASE_RE.finditer(mm):
+                                leases.append({'ip': match.group(1).decode(), 'file': lease_file})
                 except Exception as e:
                     self.logger.error(f"Error reading lease file {lease_file}: {e}")
                     
@@ -350,8 +777,55 @@ class NetworkMonitor:
             
         return dns_servers
         
+    def _get_routes_netlink(self):
+        """
+        Read the main IPv4 routing table over rtnetlink (RTM_GETROUTE)
+        
+        Returns:
+            Routes formatted like `ip route` lines, or None if pyroute2 is
+            unavailable, in which case callers fall back to `ip route`
+        """
+        try:
+            if self._ipr is None:
+                from pyroute2 import IPRoute
+                self._ipr = IPRoute()
+            routes = self._ipr.get_routes(family=socket.AF_INET, table=RT_TABLE_MAIN, type=RTN_UNICAST)
+        except Exception as e:
+            self.logger.debug(f"Netlink routing table unavailable, using ip: {e}")
+            return None
+            
+        lines = []
+        for route in routes:
+            dst = route.get_attr('RTA_DST')
+            parts = [f"{dst}/{route['dst_len']}" if dst else 'default']
+            gateway = route.get_attr('RTA_GATEWAY')
+            if gateway:
+                parts.append(f"via {gateway}")
+            oif = route.get_attr('RTA_OIF')
+            if oif:
+                try:
+                    parts.append(f"dev {socket.if_indextoname(oif)}")
+                except OSError:
+                    parts.append(f"dev if{oif}")
+            if route['proto'] in RT_PROTO_NAMES:
+                parts.append(f"proto {RT_PROTO_NAMES[route['proto']]}")
+            if route['scope'] in RT_SCOPE_NAMES:
+                parts.append(f"scope {RT_SCOPE_NAMES[route['scope']]}")
+            prefsrc = route.get_attr('RTA_PREFSRC')
+            if prefsrc:
+                parts.append(f"src {prefsrc}")
+            priority = route.get_attr('RTA_PRIORITY')
+            if priority:
+                parts.append(f"metric {priority}")
+            lines.append(' '.join(parts))
+        return lines
+        
     def get_routing_table(self):
         """Get system routing table"""
+        routes = self._get_routes_netlink()
+        if routes is not None:
+            return routes
+            
         try:
             result = subprocess.run(['ip', 'route'], capture_output=True, text=True)
             routes = []
@@ -373,70 +847,202 @@ class NetworkMonitor:
             return
             
         self.running = True
+        self._stop_event.clear()
         self.monitor_thread = threading.Thread(target=self._monitoring_loop)
         self.monitor_thread.daemon = True
         self.monitor_thread.start()
+        
+        # System info is sampled on its own cadence, off the bandwidth thread
+        self._sysinfo_thread = threading.Thread(target=self._sysinfo_loop)
+        self._sysinfo_thread.daemon = True
+        self._sysinfo_thread.start()
+        
+        # Only a config read from a file can be hot-reloaded
+        if self.config_path is not None:
+            self._watch_thread = threading.Thread(target=self._config_watch_loop)
+            self._watch_thread.daemon = True
+            self._watch_thread.start()
         self.logger.info("Network monitoring started")
         
     def stop_monitoring(self):
         """Stop network monitoring"""
         self.running = False
+        self._stop_event.set()
         if self.monitor_thread:
             self.monitor_thread.join(timeout=5)
+        if self._sysinfo_thread:
+            self._sysinfo_thread.join(timeout=5)
+        if self._watch_thread:
+            self._watch_thread.join(timeout=5)
+        if self._ipr is not None:
+            self._ipr.close()
+            self._ipr = None
+        # A sampler that didn't stop may still be reading; leave its fds alone
+        if not (self.monitor_thread and self.monitor_thread.is_alive()):
+            fds, self._proc_fds = self._proc_fds, {}
+            for fd in fds.values():
+                os.close(fd)
         self.logger.info("Network monitoring stopped")
         
+    def _pin_sampler_thread(self):
+        """Pin the calling thread to monitoring.pin_cpu, if configured and allowed"""
+        cpu = self.config['monitoring'].get('pin_cpu')
+        if cpu is None or not hasattr(os, 'sched_setaffinity'):
+            return
+            
+        try:
+            # pid 0 is the calling thread, so only the sampler moves
+            if cpu in os.sched_getaffinity(0):
+                os.sched_setaffinity(0, {cpu})
+                self.logger.debug(f"Sampling thread pinned to CPU {cpu}")
+            else:
+                self.logger.warning(f"pin_cpu {cpu} is not available to this process; sampler left unpinned")
+        except OSError as e:
+            self.logger.warning(f"Could not pin sampling thread to CPU {cpu}: {e}")
+            
     def _monitoring_loop(self):
         """Main monitoring loop"""
-        previous_stats = None
         previous_time = None
+        # Stay on one (efficiency) core so the rings and /proc reads keep their cache
+        self._pin_sampler_thread()
         
         while self.running:
             try:
-                current_time = datetime.now()
-                current_stats = self.get_network_statistics()
+                # Apply a reloaded config here, so the counter arrays are
+                # only ever reshaped by the thread that samples into them
+                config = self._pending_config
+                if config is not None:
+                    self._pending_config = None
+                    if self._apply_config(config):
+                        previous_time = None  # No rates across a changed interface set
+                        
+                current_time = time.monotonic_ns()
+                
+                # Fill the current slot; the other one holds the previous sample
+                slot = self._slot
+                counters = self._counters[slot]
+                present = self._present[slot]
+                self._read_proc_net_dev(counters, present)
                 
-                if current_stats:
-                    # Store network statistics
-                    for interface in self.interfaces:
-                        if interface in current_stats['interfaces']:
-                            self.network_history[interface].append({
-                                'timestamp': current_time,
-                                'stats': current_stats['interfaces'][interface]
-                            })
-                            
-                    # Calculate and store bandwidth
-                    if previous_stats and previous_time:
-                        time_delta = (current_time - previous_time).total_seconds()
-                        bandwidth = self.calculate_bandwidth(current_stats, previous_stats, time_delta)
+                # Store network statistics
+                for interface, i in self._iface_index.items():
+                    if present[i]:
+                        self.network_history[interface].append((current_time, *counters[i].tolist()))
                         
-                        if bandwidth:
-                            for interface in self.interfaces:
-                                if interface in bandwidth['interfaces']:
-                                    self.bandwidth_history[interface].append({
-                                        'timestamp': current_time,
-                                        'bandwidth': bandwidth['interfaces'][interface]
-                                    })
-                                    
-                    previous_stats = current_stats
-                    previous_time = current_time
-                    
-                # Update system info less frequently
-                if int(current_time.timestamp()) % self.config['monitoring']['system_update_interval'] == 0:
-                    self.system_info = self.get_system_info()
+                # Calculate and store bandwidth: one compiled pass over every interface
+                if previous_time:
+                    time_delta = (current_time - previous_time) * 1e-9
+                    if time_delta > 0:
+                        previous_slot = slot ^ 1
+                        rates = self._rates_buf
+                        _compute_rates(counters[:-1], self._counters[previous_slot, :-1], time_delta, rates)
+                        rates = rates.tolist()
+                        both = present & self._present[previous_slot]
+                        for interface, i in self._iface_index.items():
+                            if both[i]:
+                                self.bandwidth_history[interface].append((current_time, *rates[i]))
+                                
+                self._slot = slot ^ 1
+                self._last_sample_ns = current_time
+                previous_time = current_time
                     
-                time.sleep(self.update_interval)
+                self._stop_event.wait(self.update_interval)
                 
             except Exception as e:
                 self.logger.error(f"Error in monitoring loop: {e}")
-                time.sleep(self.update_interval)
+                self._stop_event.wait(self.update_interval)
                 
+    def _sysinfo_loop(self):
+        """System info loop: refresh system_info every system_update_interval seconds"""
+        while self.running:
+            interval = self.config['monitoring']['system_update_interval']
+            started = time.monotonic()
+            info = self.get_system_info()
+            if info:
+                # A single reference assignment, so readers never see a partial dict
+                self.system_info = info
+            self._stop_event.wait(max(0.0, interval - (time.monotonic() - started)))
+                
+    def _config_watch_loop(self):
+        """Watch the config file with inotify and reload it whenever it is saved"""
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if fd < 0:
+                raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()))
+        except (AttributeError, OSError) as e:
+            self.logger.debug(f"Config hot-reload unavailable: {e}")
+            return
+            
+        try:
+            # Watch the directory: editors often replace the file, which
+            # would silently end a watch on the file itself
+            directory, name = os.path.split(self.config_path)
+            if libc.inotify_add_watch(fd, directory.encode(), IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+                self.logger.debug(f"Config hot-reload unavailable: {os.strerror(ctypes.get_errno())}")
+                return
+            name = name.encode()
+            
+            poller = select.poll()
+            poller.register(fd, select.POLLIN)
+            while self.running:
+                if not poller.poll(CONFIG_WATCH_POLL_MS):
+                    continue
+                data = os.read(fd, 4096)
+                offset = 0
+                changed = False
+                while offset < len(data):
+                    _, _, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+                    offset += INOTIFY_EVENT.size
+                    if data[offset:offset + length].rstrip(b'\0') == name:
+                        changed = True
+                    offset += length
+                if changed:
+                    self._reload_config()
+        except Exception as e:
+            self.logger.error(f"Error in config watcher: {e}")
+        finally:
+            os.close(fd)
+            
+    def _reload_config(self):
+        """Re-read the config file and hand it to the monitoring loop"""
+        try:
+            config = self._read_config(self.config_path)
+        except Exception as e:
+            # Keep running on the old config, e.g. while a save is half-written
+            self.logger.error(f"Error reloading config: {e}")
+            return
+            
+        if config != self.config:
+            self._pending_config = config
+            self.logger.info(f"Config reloaded from {self.config_path}")
+            
+    def _apply_config(self, config):
+        """
+        Switch to a reloaded config
+        
+        Args:
+            config: Parsed configuration dict
+            
+        Returns:
+            True if the monitored interface set changed
+        """
+        monitoring = config['monitoring']
+        interfaces_changed = list(monitoring['interfaces']) != self.interfaces
+        if interfaces_changed:
+            self.interfaces = monitoring['interfaces']
+        self.update_interval = monitoring['network_update_interval']
+        self.data_retention = monitoring['data_retention']
+        self.config = config
+        return interfaces_changed
+        
     def get_current_status(self):
         """Get current comprehensive network status"""
         try:
             return {
                 'timestamp': datetime.now().isoformat(),
                 'interfaces': self.get_network_interfaces(),
-                'network_stats': self.get_network_statistics(),
+                'network_stats': self._statistics_json(self.get_network_statistics()),
                 'system_info': self.system_info,
                 'connections': self.get_network_connections(),
                 'dhcp_leases': self.get_dhcp_leases(),
@@ -448,36 +1054,73 @@ class NetworkMonitor:
             self.logger.error(f"Error getting current status: {e}")
             return {'error': str(e)}
             
-    def get_bandwidth_history(self, interface, duration_minutes=60):
-        """Get bandwidth history for specified interface"""
-        if interface not in self.bandwidth_history:
-            return []
+    def get_bandwidth_history(self, interface, duration_minutes=60, buckets=None):
+        """
+        Get bandwidth history for specified interface
+        
+        Args:
+            interface: Interface name
+            duration_minutes: How far back to go
+            buckets: If set, reduce the samples to at most this many
+                min/max/avg buckets (see perf_kernels.downsample_rows)
+        """
+        cutoff_time = time.monotonic_ns() - duration_minutes * 60 * 10**9
+        if buckets:
+            ring = self.bandwidth_history.get(interface)
+            rows = ring.window(cutoff_time) if ring is not None else np.zeros(0, BANDWIDTH_HISTORY_DTYPE)
+            epoch_offset_ns = time.time_ns() - time.monotonic_ns()
+            return downsample_rows(rows, RATE_FIELDS + MBPS_FIELDS, buckets,
+                                   (rows['timestamp'] + epoch_offset_ns) * 1e-9)
             
-        cutoff_time = datetime.now() - timedelta(minutes=duration_minutes)
-        history = []
+        return list(self.iter_bandwidth_history(interface, duration_minutes))
         
-        for entry in self.bandwidth_history[interface]:
-            if entry['timestamp'] > cutoff_time:
-                history.append(entry)
-                
-        return history
+    def iter_bandwidth_history(self, interface, duration_minutes=60):
+        """Yield the get_bandwidth_history entries one at a time, for streaming responses"""
+        ring = self.bandwidth_history.get(interface)
+        if ring is None:
+            return iter(())
+        cutoff_time = time.monotonic_ns() - duration_minutes * 60 * 10**9
+        return self._iter_history_entries(ring, 'bandwidth', cutoff_time)
+        
+    def _history_entries(self, ring, key, cutoff_time=None):
+        """Expand ring rows into {'timestamp': datetime, key: {field: value}} entries"""
+        return list(self._iter_history_entries(ring, key, cutoff_time))
+        
+    def _iter_history_entries(self, ring, key, cutoff_time=None):
+        """Generator form of _history_entries; the rows are snapshotted on the first next()"""
+        fields = ring.rows.dtype.names[1:]
+        # Monotonic sample times map to wall-clock time through one fixed offset
+        epoch_offset_ns = time.time_ns() - time.monotonic_ns()
+        for row in ring.since(cutoff_time):
+            yield {'timestamp': datetime.fromtimestamp((row[0] + epoch_offset_ns) * 1e-9), key: dict(zip(fields, row[1:]))}
         
     def export_data(self, filename=None):
         """Export monitoring data to JSON file"""
         if not filename:
             filename = f"network_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
             
-        data = {
-            'export_time': datetime.now().isoformat(),
-            'network_history': {k: list(v) for k, v in self.network_history.items()},
-            'bandwidth_history': {k: list(v) for k, v in self.bandwidth_history.items()},
-            'system_info': self.system_info,
-            'current_status': self.get_current_status()
-        }
+        # Written block by block so only one interface's history is
+        # expanded at a time. The sampler may add interfaces meanwhile, so
+        # iterate over a copy of the keys; each ring is read from its own
+        # snapshot
+        sections = (
+            ('network_history', self.network_history, 'stats'),
+            ('bandwidth_history', self.bandwidth_history, 'bandwidth'),
+        )
         
         try:
-            with open(filename, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
+            with open(filename, 'wb') as f:
+                f.write(b'{\n"export_time": ' + _dumps_json(datetime.now().isoformat()))
+                for section, histories, key in sections:
+                    f.write(b',\n' + _dumps_json(section) + b': {')
+                    separator = b'\n'
+                    for name, ring in list(histories.items()):
+                        f.write(separator + _dumps_json(name) + b': ' + _dumps_json(self._history_entries(ring, key)))
+                        separator = b',\n'
+                    f.write(b'\n}')
+                f.write(b',\n"system_info": ' + _dumps_json(self.system_info))
+                f.write(b',\n"current_status": ' + _dumps_json(self.get_current_status()))
+                f.write(b'\n}\n')
             self.logger.info(f"Data exported to {filename}")
             return filename
         except Exception as e:
@@ -502,7 +1145,7 @@ def main():
         
     if args.status:
         status = monitor.get_current_status()
-        print(json.dumps(status, indent=2, default=str))
+        sys.stdout.buffer.write(_dumps_json(status) + b'\n')
     elif args.continuous:
         try:
             monitor.start_monitoring()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Numerical kernels shared by the monitoring modules
+Compiled with Numba when it is installed, plain NumPy/Python otherwise
+"""
+
+from datetime import datetime
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    # Without Numba the kernels below run as plain Python
+    def njit(*args, **kwargs):
+        return lambda func: func
+    
+    
+@njit(cache=True, fastmath=True)
+def downsample(ts, values, n_buckets):
+    """
+    Reduce a time series to at most n_buckets min/max/avg buckets
+    
+    Buckets hold equal numbers of consecutive samples, so no bucket is
+    empty however irregular the sampling was.
+    
+    Args:
+        ts: float64 array (n,) of sample times, ascending
+        values: float64 array (n, k) of samples, one column per series
+        n_buckets: Maximum number of buckets
+    
+    Returns:
+        Tuple (bucket mean times, mins, maxs, avgs); the last three are (buckets, k)
+    """
+    n = ts.shape[0]
+    k = values.shape[1]
+    buckets = min(n_buckets, n)
+    ts_out = np.empty(buckets)
+    mins = np.empty((buckets, k))
+    maxs = np.empty((buckets, k))
+    avgs = np.empty((buckets, k))
+    
+    for b in range(buckets):
+        start = b * n // buckets
+        end = (b + 1) * n // buckets
+        count = end - start
+        
+        t_sum = 0.0
+        for i in range(start, end):
+            t_sum += ts[i]
+        ts_out[b] = t_sum / count
+        
+        for j in range(k):
+            lo = values[start, j]
+            hi = lo
+            total = 0.0
+            for i in range(start, end):
+                v = values[i, j]
+                if v < lo:
+                    lo = v
+                if v > hi:
+                    hi = v
+                total += v
+            mins[b, j] = lo
+            maxs[b, j] = hi
+            avgs[b, j] = total / count
+    
+    return ts_out, mins, maxs, avgs
+    
+    
+def downsample_rows(rows, fields, n_buckets, ts_seconds):
+    """
+    Downsample structured history rows into a JSON-ready bucketed series
+    
+    Args:
+        rows: Structured array of samples, oldest first
+        fields: Names of the numeric fields to reduce
+        n_buckets: Maximum number of buckets
+        ts_seconds: Wall-clock UNIX seconds of each row (float64 array)
+    
+    Returns:
+        Dict with 'timestamp' (ISO time of each bucket's mean) and 'min', 'max', 'avg',
+        each mapping field -> list of bucket values
+    """
+    values = np.empty((len(rows), len(fields)))
+    for j, field in enumerate(fields):
+        values[:, j] = rows[field]
+    
+    ts_out, mins, maxs, avgs = downsample(np.ascontiguousarray(ts_seconds, dtype=np.float64),
+                                          values, max(1, int(n_buckets)))
+    return {
+        'timestamp': [datetime.fromtimestamp(t).isoformat() for t in ts_out.tolist()],
+        'min': {field: mins[:, j].tolist() for j, field in enumerate(fields)},
+        'max': {field: maxs[:, j].tolist() for j, field in enumerate(fields)},
+        'avg': {field: avgs[:, j].tolist() for j, field in enumerate(fields)},
+    }
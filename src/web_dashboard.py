@@ -10,21 +10,95 @@ import json
 import logging
 import threading
 import time
+import socket
+import gzip
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from flask import Flask, render_template, request, jsonify, Response
+from flask import Flask, render_template, request, jsonify, Response, json as flask_json
+from flask.json.provider import JSONProvider
 from flask_socketio import SocketIO, emit
 import yaml
 from pathlib import Path
 
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Auto-detect config path
 SCRIPT_DIR = Path(__file__).parent
 CONFIG_PATH = SCRIPT_DIR.parent / "config" / "settings.yaml"
 
-# Import our modules
-sys.path.append(str(SCRIPT_DIR))
+# Real OS threads for Socket.IO: the capture and sampling threads block in
+# C (V4L2 ioctls, OpenCV reads) and set CPU affinity, which green threads
+# from eventlet/gevent monkey-patching would stall or apply process-wide.
+# With simple-websocket installed each client gets a native WebSocket on
+# its own thread, so slow requests don't hold up broadcasts.
+SOCKETIO_ASYNC_MODE = "threading"
+
+class ORJSONProvider(JSONProvider):
+    """Flask JSON provider backed by orjson, used for jsonify when it is installed"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS, default=str).decode()
+        
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+        
+        
+def _flatten_status(value, prefix=(), out=None):
+    """
+    Flatten nested dicts into {key path tuple: leaf value}
+    
+    Lists and empty dicts are leaves, compared and sent whole.
+    """
+    if out is None:
+        out = {}
+    if isinstance(value, dict) and value:
+        for key, item in value.items():
+            _flatten_status(item, prefix + (key,), out)
+    else:
+        out[prefix] = value
+    return out
+    
+    
+# Seconds a subsystem status result is reused across requests and broadcasts
+STATUS_CACHE_TTL = 1.0
+
+# Status fields that change on every read without anything else changing;
+# left out of the /api/status ETag so idle polls still revalidate to 304
+VOLATILE_STATUS_KEYS = frozenset({'timestamp', 'runtime_seconds'})
+
+# Seconds browsers may reuse the dashboard page before revalidating its ETag
+INDEX_MAX_AGE = 300
+
+# Bytes of encoded history rows gathered before each chunk of a streamed response
+STREAM_CHUNK_SIZE = 16 * 1024
+
+# Seconds between real-time broadcasts while clients are connected; link and
+# address changes reported by rtnetlink are pushed immediately instead
+BROADCAST_INTERVAL = 2.0
+RTMGRP_LINK = 0x1
+RTMGRP_IPV4_IFADDR = 0x10
+RTMGRP_IPV6_IFADDR = 0x100
+LINK_WATCH_TIMEOUT = 1.0  # Seconds the netlink watcher blocks before checking for stop
+# rtnetlink events arrive in bursts (wireless link updates, IPv6 address
+# churn): act once the socket has been quiet this long, at the latest this
+# long after the first event, and never more often than the status cache TTL
+LINK_EVENT_QUIET = 0.2
+LINK_EVENT_MAX_DELAY = 1.0
+LINK_WAKE_MIN_INTERVAL = STATUS_CACHE_TTL
+
+# Import our modules; they sit next to this file, which Python already
+# puts first on sys.path when it is run as a script
 from ap_manager import APManager
 from network_monitor import NetworkMonitor
-from camera_streamer import CameraStreamer
 
 class WebDashboard:
     def __init__(self, config_path=None):
@@ -39,34 +113,83 @@ class WebDashboard:
         self.config = self.load_config(config_path)
         self.web_config = self.config['web']
         self.logger = self.setup_logging()
+        # The config doesn't change while running, so serialize it once
+        self._config_json = json.dumps(self.config, default=str).encode()
+        self._status_cache = {}  # key -> (monotonic expiry, value), see _cached
         
         # Initialize Flask app
         self.app = Flask(__name__, 
                         template_folder='/workspaces/new-wave-linux/web/templates',
                         static_folder='/workspaces/new-wave-linux/web/static')
         self.app.config['SECRET_KEY'] = 'radxa-rock5b-secret-key'
+        if orjson is not None:
+            self.app.json = ORJSONProvider(self.app)
         
-        # Initialize SocketIO
-        self.socketio = SocketIO(self.app, cors_allowed_origins="*")
+        # Initialize SocketIO. python-socketio encodes a broadcast packet once
+        # for all recipients; routing that encode through the app's JSON
+        # provider makes it orjson too.
+        self.socketio = SocketIO(self.app, cors_allowed_origins="*", async_mode=SOCKETIO_ASYNC_MODE,
+                                 json=flask_json)
         
         # Initialize system components
-        self.ap_manager = APManager(config_path)
-        self.network_monitor = NetworkMonitor(config_path)
-        self.camera_streamer = CameraStreamer(config_path)
+        # Subsystems get the dict parsed above instead of each re-reading the file
+        self.ap_manager = APManager(self.config)
+        self.network_monitor = NetworkMonitor(self.config)
+        self._camera_streamer = None  # Created on first use, see camera_streamer
+        self._camera_lock = threading.Lock()
+        self._camera_loaded = False
+        
+        # Queries the three subsystems side by side; their calls mostly
+        # wait on syscalls and subprocesses, which release the GIL
+        self._pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix='status')
         
         # Background monitoring
         self.monitoring_active = False
-        self.monitoring_thread = None
+        self.monitoring_task = None
+        self._monitoring_run = 0  # Bumped per start so tasks from a previous run exit
+        self._index_page = None  # (etag, html bytes, gzipped html), rendered on first request
+        self._last_flat = {}  # Last broadcast status, flattened, for deltas and new clients
+        self._last_timestamp = (0.0, None)  # (UNIX time, ISO string) of the last broadcast tick
+        self._link_task = None
+        self._clients = set()  # Connected Socket.IO session ids
+        self._wake_event = threading.Event()  # Set to broadcast before the next tick
+        
+        # Static part of /api/status
+        self._system_config = {
+            'ap_ssid': self.config['network']['ap_config']['ssid'],
+            'rtsp_port': self.config['camera']['rtsp']['port'],
+            'web_port': self.config['web']['port']
+        }
         
         # Setup routes
         self.setup_routes()
         self.setup_socketio_events()
         
+    @property
+    def camera_streamer(self):
+        """
+        CameraStreamer, imported and created on first use
+        
+        Importing it pulls in OpenCV, which dominates startup on the board
+        and isn't needed to serve the dashboard itself. None if OpenCV (or
+        another camera dependency) is missing.
+        """
+        if not self._camera_loaded:
+            with self._camera_lock:
+                if not self._camera_loaded:
+                    try:
+                        from camera_streamer import CameraStreamer
+                        self._camera_streamer = CameraStreamer(self.config)
+                    except ImportError as e:
+                        self.logger.warning(f"Camera support unavailable: {e}")
+                    self._camera_loaded = True
+        return self._camera_streamer
+        
     def load_config(self, config_path):
         """Load configuration from YAML file"""
         try:
             with open(config_path, 'r') as file:
-                return yaml.safe_load(file)
+                return yaml.load(file, Loader=YamlLoader)
         except Exception as e:
             print(f"Error loading config: {e}")
             sys.exit(1)
@@ -79,29 +202,153 @@ class WebDashboard:
         )
         return logging.getLogger(__name__)
         
+    def _cached(self, key, fn, ttl=STATUS_CACHE_TTL):
+        """
+        Return fn()'s result, reusing it for ttl seconds
+        
+        Dashboard clients poll faster than the underlying status changes,
+        so REST handlers and the broadcast loop share one result per key.
+        
+        Args:
+            key: Cache key
+            fn: Zero-argument callable producing the value
+            ttl: Seconds to reuse the value
+        """
+        now = time.monotonic()
+        entry = self._status_cache.get(key)
+        if entry is not None and now < entry[0]:
+            return entry[1]
+        value = fn()
+        self._status_cache[key] = (now + ttl, value)
+        return value
+        
+    def _ap_status(self):
+        return self._cached('ap', self.ap_manager.get_ap_status)
+        
+    def _network_status(self):
+        return self._cached('network', self.network_monitor.get_current_status)
+        
+    def _camera_status(self):
+        camera_streamer = self.camera_streamer
+        if camera_streamer is None:
+            return {'error': 'camera unavailable'}
+        return self._cached('camera', camera_streamer.get_stream_stats)
+        
+    def _collect_status(self):
+        """
+        Fetch AP, network and camera status concurrently
+        
+        Returns:
+            Tuple (ap_status, network_status, camera_status)
+        """
+        futures = [self._pool.submit(fn) for fn in (self._ap_status, self._network_status, self._camera_status)]
+        return tuple(future.result() for future in futures)
+        
+    def _status_response(self):
+        """
+        Build the /api/status body and its ETag
+        
+        The tag covers every field except VOLATILE_STATUS_KEYS, so it only
+        changes when the status itself does.
+        
+        Returns:
+            Tuple (etag, JSON bytes)
+        """
+        ap_status, network_status, camera_status = self._collect_status()
+        status = {
+            'timestamp': self._timestamp(),
+            'ap_status': ap_status,
+            'network_status': network_status,
+            'camera_status': camera_status,
+            'system_config': self._system_config
+        }
+        body = self.app.json.dumps(status).encode()
+        stable = [[list(path), value] for path, value in _flatten_status(status).items()
+                  if not path or path[-1] not in VOLATILE_STATUS_KEYS]
+        etag = hashlib.blake2b(self.app.json.dumps(stable).encode(), digest_size=8).hexdigest()
+        return etag, body
+        
+    def _timestamp(self):
+        """
+        ISO timestamp for a status response
+        
+        Returns:
+            The last broadcast tick's timestamp while it is under one
+            BROADCAST_INTERVAL old, otherwise the current time
+        """
+        now = time.time()
+        tick, tick_iso = self._last_timestamp
+        if tick_iso is not None and 0 <= now - tick < BROADCAST_INTERVAL:
+            return tick_iso
+        return datetime.fromtimestamp(now).isoformat()
+        
+    def _stream_json_array(self, items):
+        """
+        Stream an iterable as a JSON array response
+        
+        Items are encoded one by one with the app's JSON provider and sent in
+        STREAM_CHUNK_SIZE chunks, so neither the whole list nor the whole
+        document is held in memory. No Content-Length is set: the response
+        goes out chunked.
+        """
+        dumps = self.app.json.dumps
+        
+        def generate():
+            chunk = [b'[']
+            size = 1
+            separator = b''
+            for item in items:
+                encoded = separator + dumps(item).encode()
+                separator = b','
+                chunk.append(encoded)
+                size += len(encoded)
+                if size >= STREAM_CHUNK_SIZE:
+                    yield b''.join(chunk)
+                    chunk = []
+                    size = 0
+            chunk.append(b']')
+            yield b''.join(chunk)
+            
+        return Response(generate(), mimetype='application/json')
+        
     def setup_routes(self):
         """Setup Flask routes"""
         
+        def camera_unavailable():
+            return jsonify({'error': 'camera unavailable'}), 503
+            
         @self.app.route('/')
         def index():
-            return render_template('dashboard.html')
+            # The page takes no template variables: render and compress it once
+            if self._index_page is None:
+                html = render_template('dashboard.html').encode()
+                self._index_page = (hashlib.sha1(html).hexdigest(), html, gzip.compress(html, 9))
+            etag, html, html_gz = self._index_page
+            
+            if request.if_none_match.contains(etag):
+                response = Response(status=304)
+            elif 'gzip' in request.accept_encodings:
+                response = Response(html_gz, mimetype='text/html')
+                response.headers['Content-Encoding'] = 'gzip'
+            else:
+                response = Response(html, mimetype='text/html')
+            response.set_etag(etag)
+            response.headers['Vary'] = 'Accept-Encoding'
+            response.headers['Cache-Control'] = f'public, max-age={INDEX_MAX_AGE}'
+            return response
             
         @self.app.route('/api/status')
         def get_status():
             """Get overall system status"""
             try:
-                status = {
-                    'timestamp': datetime.now().isoformat(),
-                    'ap_status': self.ap_manager.get_ap_status(),
-                    'network_status': self.network_monitor.get_current_status(),
-                    'camera_status': self.camera_streamer.get_stream_stats(),
-                    'system_config': {
-                        'ap_ssid': self.config['network']['ap_config']['ssid'],
-                        'rtsp_port': self.config['camera']['rtsp']['port'],
-                        'web_port': self.config['web']['port']
-                    }
-                }
-                return jsonify(status)
+                etag, body = self._cached('status', self._status_response)
+                if request.if_none_match.contains(etag):
+                    response = Response(status=304)
+                else:
+                    response = Response(body, mimetype='application/json')
+                response.set_etag(etag)
+                response.headers['Cache-Control'] = 'no-cache'
+                return response
             except Exception as e:
                 self.logger.error(f"Error getting status: {e}")
                 return jsonify({'error': str(e)}), 500
@@ -129,12 +376,16 @@ class WebDashboard:
         @self.app.route('/api/camera/start', methods=['POST'])
         def start_camera():
             """Start camera streaming"""
+            camera_streamer = self.camera_streamer
+            if camera_streamer is None:
+                return camera_unavailable()
+                
             try:
                 data = request.get_json()
                 camera_device = data.get('device', self.config['camera']['default_device'])
                 
-                if self.camera_streamer.connect_camera(camera_device):
-                    success = self.camera_streamer.start_streaming()
+                if camera_streamer.connect_camera(camera_device):
+                    success = camera_streamer.start_streaming()
                     return jsonify({'success': success})
                 else:
                     return jsonify({'success': False, 'error': 'Failed to connect camera'})
@@ -145,9 +396,13 @@ class WebDashboard:
         @self.app.route('/api/camera/stop', methods=['POST'])
         def stop_camera():
             """Stop camera streaming"""
+            camera_streamer = self.camera_streamer
+            if camera_streamer is None:
+                return camera_unavailable()
+                
             try:
-                self.camera_streamer.stop_streaming()
-                self.camera_streamer.disconnect_camera()
+                camera_streamer.stop_streaming()
+                camera_streamer.disconnect_camera()
                 return jsonify({'success': True})
             except Exception as e:
                 self.logger.error(f"Error stopping camera: {e}")
@@ -156,12 +411,16 @@ class WebDashboard:
         @self.app.route('/api/camera/rtsp/start', methods=['POST'])
         def start_rtsp():
             """Start RTSP server"""
+            camera_streamer = self.camera_streamer
+            if camera_streamer is None:
+                return camera_unavailable()
+                
             try:
-                if not self.camera_streamer.camera:
-                    if not self.camera_streamer.connect_camera():
+                if not camera_streamer.camera:
+                    if not camera_streamer.connect_camera():
                         return jsonify({'success': False, 'error': 'Failed to connect camera'})
                         
-                success = self.camera_streamer.start_rtsp_server()
+                success = camera_streamer.start_rtsp_server()
                 return jsonify({'success': success})
             except Exception as e:
                 self.logger.error(f"Error starting RTSP: {e}")
@@ -170,8 +429,12 @@ class WebDashboard:
         @self.app.route('/api/camera/rtsp/stop', methods=['POST'])
         def stop_rtsp():
             """Stop RTSP server"""
+            camera_streamer = self.camera_streamer
+            if camera_streamer is None:
+                return camera_unavailable()
+                
             try:
-                self.camera_streamer.stop_rtsp_server()
+                camera_streamer.stop_rtsp_server()
                 return jsonify({'success': True})
             except Exception as e:
                 self.logger.error(f"Error stopping RTSP: {e}")
@@ -192,8 +455,12 @@ class WebDashboard:
             """Get bandwidth history for interface"""
             try:
                 duration = request.args.get('duration', 60, type=int)
-                history = self.network_monitor.get_bandwidth_history(interface, duration)
-                return jsonify(history)
+                # ?buckets=N returns min/max/avg buckets instead of every sample
+                buckets = request.args.get('buckets', type=int)
+                if buckets:
+                    # Bounded size: a plain response with Content-Length
+                    return jsonify(self.network_monitor.get_bandwidth_history(interface, duration, buckets))
+                return self._stream_json_array(self.network_monitor.iter_bandwidth_history(interface, duration))
             except Exception as e:
                 self.logger.error(f"Error getting bandwidth history: {e}")
                 return jsonify({'error': str(e)}), 500
@@ -201,10 +468,15 @@ class WebDashboard:
         @self.app.route('/api/camera/bandwidth')
         def get_camera_bandwidth():
             """Get camera bandwidth history"""
+            camera_streamer = self.camera_streamer
+            if camera_streamer is None:
+                return camera_unavailable()
+                
             try:
                 duration = request.args.get('duration', 60, type=int)
-                history = self.camera_streamer.get_bandwidth_history(duration)
-                return jsonify(history)
+                buckets = request.args.get('buckets', type=int)
+                history = camera_streamer.get_bandwidth_history(duration, buckets)
+                return jsonify(history) if buckets else self._stream_json_array(history)
             except Exception as e:
                 self.logger.error(f"Error getting camera bandwidth: {e}")
                 return jsonify({'error': str(e)}), 500
@@ -212,8 +484,12 @@ class WebDashboard:
         @self.app.route('/api/cameras')
         def list_cameras():
             """List available cameras"""
+            camera_streamer = self.camera_streamer
+            if camera_streamer is None:
+                return camera_unavailable()
+                
             try:
-                cameras = self.camera_streamer.list_cameras()
+                cameras = camera_streamer.list_cameras()
                 return jsonify(cameras)
             except Exception as e:
                 self.logger.error(f"Error listing cameras: {e}")
@@ -222,7 +498,7 @@ class WebDashboard:
         @self.app.route('/api/config')
         def get_config():
             """Get current configuration"""
-            return jsonify(self.config)
+            return Response(self._config_json, mimetype='application/json')
             
         @self.app.route('/api/config', methods=['POST'])
         def update_config():
@@ -242,11 +518,24 @@ class WebDashboard:
         @self.socketio.on('connect')
         def handle_connect():
             self.logger.info('Client connected to WebSocket')
+            self._clients.add(request.sid)
             emit('status', {'message': 'Connected to Radxa Dashboard'})
+            # Later ticks only carry changes, so start this client from a full copy
+            last_flat = self._last_flat
+            if last_flat:
+                emit('real_time_delta', {
+                    'full': True,
+                    'set': [[list(path), value] for path, value in last_flat.items()],
+                    'unset': []
+                })
+            else:
+                # Nothing broadcast yet (the loop idles without clients)
+                self._wake_event.set()
             
         @self.socketio.on('disconnect')
         def handle_disconnect():
             self.logger.info('Client disconnected from WebSocket')
+            self._clients.discard(request.sid)
             
         @self.socketio.on('start_monitoring')
         def handle_start_monitoring():
@@ -268,45 +557,143 @@ class WebDashboard:
             return
             
         self.monitoring_active = True
+        self._monitoring_run += 1
+        self._last_flat = {}
         self.network_monitor.start_monitoring()
         
-        self.monitoring_thread = threading.Thread(target=self._monitoring_loop)
-        self.monitoring_thread.daemon = True
-        self.monitoring_thread.start()
+        # Socket.IO background tasks run on whatever the async mode schedules
+        # emits on, so broadcasts don't hop between threads
+        run = self._monitoring_run
+        self.monitoring_task = self.socketio.start_background_task(self._monitoring_loop, run)
+        self._link_task = self.socketio.start_background_task(self._link_watch_loop, run)
         
         self.logger.info("Real-time monitoring started")
         
     def stop_monitoring(self):
         """Stop background monitoring"""
         self.monitoring_active = False
+        self._wake_event.set()
         self.network_monitor.stop_monitoring()
         
-        if self.monitoring_thread:
-            self.monitoring_thread.join(timeout=5)
-            
+        # The tasks notice on their next wake-up and exit; nothing to wait for
+        self.monitoring_task = None
+        self._link_task = None
+        
         self.logger.info("Real-time monitoring stopped")
         
-    def _monitoring_loop(self):
-        """Background monitoring loop for real-time updates"""
-        while self.monitoring_active:
+    def _monitoring_loop(self, run):
+        """
+        Background monitoring loop for real-time updates
+        
+        Args:
+            run: Monitoring run this task belongs to (see start_monitoring)
+        """
+        while self._monitoring_current(run):
             try:
-                # Get current status
+                # Nobody to send to: skip the status queries entirely
+                if not self._clients:
+                    self._wait_for_wake()
+                    continue
+                    
+                # Get current status, stamped once for the whole tick
+                now = time.time()
+                now_iso = datetime.fromtimestamp(now).isoformat()
+                self._last_timestamp = (now, now_iso)
+                ap_status, network_status, camera_status = self._collect_status()
                 status_data = {
-                    'timestamp': datetime.now().isoformat(),
-                    'network': self.network_monitor.get_current_status(),
-                    'camera': self.camera_streamer.get_stream_stats(),
-                    'ap': self.ap_manager.get_ap_status()
+                    'timestamp': now_iso,
+                    'network': network_status,
+                    'camera': camera_status,
+                    'ap': ap_status
                 }
                 
-                # Emit to all connected clients
-                self.socketio.emit('real_time_data', status_data)
-                
-                time.sleep(2)  # Update every 2 seconds
+                # Emit only what changed since the last tick to all connected clients
+                flat = _flatten_status(status_data)
+                last_flat = self._last_flat
+                delta = {
+                    'set': [[list(path), value] for path, value in flat.items()
+                            if path not in last_flat or last_flat[path] != value],
+                    'unset': [list(path) for path in last_flat if path not in flat]
+                }
+                self._last_flat = flat
+                if delta['set'] or delta['unset']:
+                    self.socketio.emit('real_time_delta', delta)
+                    
+                self._wait_for_wake()
                 
             except Exception as e:
                 self.logger.error(f"Error in monitoring loop: {e}")
-                time.sleep(5)
+                self.socketio.sleep(5)
+                
+    def _monitoring_current(self, run):
+        """Whether a background task started for run should keep going"""
+        return self.monitoring_active and self._monitoring_run == run
+        
+    def _wait_for_wake(self):
+        """Sleep until the next broadcast tick or an early wake-up"""
+        self._wake_event.wait(BROADCAST_INTERVAL)
+        self._wake_event.clear()
+        
+    def _link_watch_loop(self, run):
+        """
+        Push link and address changes to clients as the kernel reports them
+        
+        Subscribes to the rtnetlink link and address multicast groups; any
+        message means the interface list is stale, so the cached network
+        status is dropped and the broadcast loop woken without waiting
+        for its next tick. Bursts are coalesced into one wake-up (see
+        LINK_EVENT_QUIET).
+        
+        Args:
+            run: Monitoring run this task belongs to (see start_monitoring)
+        """
+        try:
+            sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+            sock.bind((0, RTMGRP_LINK | RTMGRP_IPV4_IFADDR | RTMGRP_IPV6_IFADDR))
+        except (AttributeError, OSError) as e:
+            self.logger.debug(f"Link change notifications unavailable: {e}")
+            return
+            
+        first_event = None  # Monotonic time of the first event not yet acted on
+        last_event = 0.0
+        last_wake = float('-inf')
+        with sock:
+            while self._monitoring_current(run):
+                if first_event is None:
+                    sock.settimeout(LINK_WATCH_TIMEOUT)
+                else:
+                    due = self._link_wake_due(first_event, last_event, last_wake)
+                    sock.settimeout(max(due - time.monotonic(), 0.001))
+                try:
+                    sock.recv(65536)
+                    last_event = time.monotonic()
+                    if first_event is None:
+                        first_event = last_event
+                except socket.timeout:
+                    if first_event is None:
+                        continue
+                except OSError as e:
+                    self.logger.error(f"Error in link watcher: {e}")
+                    return
+                    
+                now = time.monotonic()
+                due = self._link_wake_due(first_event, last_event, last_wake)
+                if now < due:
+                    continue
+                first_event = None
+                last_wake = now
                 
+                self.network_monitor.invalidate_interface_cache()
+                self._status_cache.pop('network', None)
+                self._status_cache.pop('status', None)
+                self._wake_event.set()
+                
+    @staticmethod
+    def _link_wake_due(first_event, last_event, last_wake):
+        """Monotonic time at which pending link events should be acted on"""
+        return max(min(last_event + LINK_EVENT_QUIET, first_event + LINK_EVENT_MAX_DELAY),
+                   last_wake + LINK_WAKE_MIN_INTERVAL)
+        
     def run(self):
         """Run the web dashboard"""
         host = self.web_config['host']
@@ -316,11 +703,18 @@ class WebDashboard:
         self.logger.info(f"Starting web dashboard on {host}:{port}")
         
         try:
-            self.socketio.run(self.app, host=host, port=port, debug=debug)
+            # Werkzeug's threaded server is the threading-mode server; allow it
+            # when started without a TTY (systemd) instead of refusing to run.
+            # The reloader stays off even with debug: it would fork a second
+            # interpreter that stats every module file each second, so code
+            # changes need a restart
+            self.socketio.run(self.app, host=host, port=port, debug=debug,
+                              use_reloader=False, allow_unsafe_werkzeug=True)
         except KeyboardInterrupt:
             self.logger.info("Shutting down web dashboard")
         finally:
             self.stop_monitoring()
+            self._pool.shutdown(wait=False)
 
 def main():
     import argparse
@@ -6,11 +6,15 @@ Tests basic imports and functionality without requiring root privileges
 
 import os
 import sys
+import importlib.util
 from pathlib import Path
 
-# Add src directory to path
+# Put src first on the path, once, so our modules resolve before the
+# interpreter walks site-packages for them
 SCRIPT_DIR = Path(__file__).parent
-sys.path.append(str(SCRIPT_DIR / "src"))
+SRC_DIR = str(SCRIPT_DIR / "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
 
 # Auto-detect config path
 CONFIG_PATH = SCRIPT_DIR / "config" / "settings.yaml"
@@ -50,7 +54,12 @@ def test_basic_imports():
         print(f"❌ Flask import failed: {e}")
 
 def test_config_loading():
-    """Test configuration file loading"""
+    """
+    Test configuration file loading
+    
+    Returns:
+        The parsed config, shared by the subsystem tests, or None on failure
+    """
     print(f"\nTesting config loading from: {CONFIG_PATH}")
     
     try:
@@ -58,7 +67,7 @@ def test_config_loading():
         
         if not CONFIG_PATH.exists():
             print(f"❌ Config file not found: {CONFIG_PATH}")
-            return False
+            return None
             
         with open(CONFIG_PATH, 'r') as f:
             config = yaml.safe_load(f)
@@ -66,61 +75,92 @@ def test_config_loading():
         print("✅ Config file loaded successfully")
         print(f"   Network interface: {config.get('network', {}).get('wifi_interface', 'Not set')}")
         print(f"   AP SSID: {config.get('network', {}).get('ap_config', {}).get('ssid', 'Not set')}")
-        return True
+        return config
         
     except Exception as e:
         print(f"❌ Config loading failed: {e}")
-        return False
+        return None
 
-# Test AP manager (import only)
-print("\nTesting AP manager...")
-try:
-    from ap_manager import APManager
-    
-    # Test config loading
-    ap = APManager(str(CONFIG_PATH))
-    print("✅ AP manager import and config loading successful")
-    
-    # Test interface checking
-    import netifaces
-    interfaces = netifaces.interfaces()
-    print(f"✅ Available interfaces: {interfaces}")
-    
-except Exception as e:
-    print(f"❌ AP manager test failed: {e}")
+# Subsystem tests take the already-parsed config (and parse the file
+# themselves when run without one)
 
-# Test network monitor (import only)
-print("\nTesting network monitor...")
-try:
-    from network_monitor import NetworkMonitor
-    
-    monitor = NetworkMonitor(str(CONFIG_PATH))
-    print("✅ Network monitor import and config loading successful")
-    
-except Exception as e:
-    print(f"❌ Network monitor test failed: {e}")
+def missing_modules(*modules):
+    """Return the modules in `modules` that are not installed"""
+    return [module for module in modules if importlib.util.find_spec(module) is None]
 
-# Test camera streamer (import only)
-print("\nTesting camera streamer...")
-try:
-    from camera_streamer import CameraStreamer
-    
-    streamer = CameraStreamer(str(CONFIG_PATH))
-    print("✅ Camera streamer import and config loading successful")
-    
-except Exception as e:
-    print(f"❌ Camera streamer test failed: {e}")
+def test_ap_manager(config=None):
+    """Test AP manager (construction only)"""
+    print("\nTesting AP manager...")
+    missing = missing_modules('netifaces')
+    if missing:
+        print(f"⚠️  Skipping AP manager test, missing: {', '.join(missing)}")
+        return
+        
+    try:
+        from ap_manager import APManager
+        
+        APManager(config if config is not None else str(CONFIG_PATH))
+        print("✅ AP manager import and config loading successful")
+        
+        # Test interface checking
+        import netifaces
+        interfaces = netifaces.interfaces()
+        print(f"✅ Available interfaces: {interfaces}")
+        
+    except Exception as e:
+        print(f"❌ AP manager test failed: {e}")
 
-# Test web dashboard (import only)
-print("\nTesting web dashboard...")
-try:
-    from web_dashboard import WebDashboard
-    
-    dashboard = WebDashboard(str(CONFIG_PATH))
-    print("✅ Web dashboard import and config loading successful")
-    
-except Exception as e:
-    print(f"❌ Web dashboard test failed: {e}")
+def test_network_monitor(config=None):
+    """Test network monitor (construction only)"""
+    print("\nTesting network monitor...")
+    missing = missing_modules('psutil', 'netifaces', 'numpy')
+    if missing:
+        print(f"⚠️  Skipping network monitor test, missing: {', '.join(missing)}")
+        return
+        
+    try:
+        from network_monitor import NetworkMonitor
+        
+        NetworkMonitor(config if config is not None else str(CONFIG_PATH))
+        print("✅ Network monitor import and config loading successful")
+        
+    except Exception as e:
+        print(f"❌ Network monitor test failed: {e}")
+
+def test_camera_streamer(config=None):
+    """Test camera streamer (construction only)"""
+    print("\nTesting camera streamer...")
+    missing = missing_modules('cv2', 'numpy')
+    if missing:
+        print(f"⚠️  Skipping camera streamer test, missing: {', '.join(missing)}")
+        return
+        
+    try:
+        from camera_streamer import CameraStreamer
+        
+        CameraStreamer(config if config is not None else str(CONFIG_PATH))
+        print("✅ Camera streamer import and config loading successful")
+        
+    except Exception as e:
+        print(f"❌ Camera streamer test failed: {e}")
+
+def test_web_dashboard():
+    """Test web dashboard (construction only)"""
+    print("\nTesting web dashboard...")
+    missing = missing_modules('flask', 'flask_socketio')
+    if missing:
+        print(f"⚠️  Skipping web dashboard test, missing: {', '.join(missing)}")
+        return
+        
+    try:
+        from web_dashboard import WebDashboard
+        
+        # Parses the config itself and hands it to its subsystems
+        WebDashboard(str(CONFIG_PATH))
+        print("✅ Web dashboard import and config loading successful")
+        
+    except Exception as e:
+        print(f"❌ Web dashboard test failed: {e}")
 
 def main():
     """Main test function"""
@@ -130,7 +170,15 @@ def main():
     
     # Run basic tests
     test_basic_imports()
-    config_ok = test_config_loading()
+    config = test_config_loading()
+    config_ok = config is not None
+    
+    # Subsystem tests share the config parsed above
+    if config_ok:
+        test_ap_manager(config)
+        test_network_monitor(config)
+        test_camera_streamer(config)
+    test_web_dashboard()
     
     if config_ok:
         print("\n=== All basic tests completed ===")